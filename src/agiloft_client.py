@@ -21,7 +21,7 @@ import logging
 import os
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
 
 # Handle both direct execution and package imports
 try:
@@ -79,7 +79,11 @@ class AgiloftClient:
         """Ensure HTTP session is created."""
         if self.session is None or self.session.closed:
             timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            # Tool calls from an agent are often more than aiohttp's default
+            # 15s apart; keep idle connections (and DNS answers) around longer
+            # so follow-up calls reuse the TLS connection instead of redialing.
+            connector = aiohttp.TCPConnector(keepalive_timeout=60, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
 
     async def close(self):
         """Close the HTTP session."""
@@ -92,11 +96,13 @@ class AgiloftClient:
         Tries token refresh first (if a refresh token is available),
         falling back to full authentication on failure.
         """
+        # Fast path: every API call lands here, and the token is almost
+        # always still valid, so don't queue behind the lock to find that out.
+        if not self._token_needs_refresh():
+            return
+
         async with self._auth_lock:
-            now = datetime.now()
-            if (self.access_token is None or
-                self.token_expires_at is None or
-                    now >= self.token_expires_at - timedelta(minutes=1)):
+            if self._token_needs_refresh():
 
                 # Try refresh first if available
                 if self.refresh_token:
@@ -109,6 +115,12 @@ class AgiloftClient:
 
                 await self._authenticate()
 
+    def _token_needs_refresh(self) -> bool:
+        """True if there is no token or it expires within the next minute."""
+        return (self.access_token is None or
+                self.token_expires_at is None or
+                datetime.now() >= self.token_expires_at - timedelta(minutes=1))
+
     async def _authenticate(self):
         """Route to the correct authentication method."""
         if self.auth_method == "oauth2_client_credentials":
@@ -489,7 +501,12 @@ class AgiloftClient:
         On 401, uses a lock to prevent concurrent refresh races. If another
         coroutine already refreshed the token, reuses it. Otherwise tries
         refresh_token first, falling back to full re-authentication.
+
+        A request body that can only be sent once (e.g. multipart form data
+        streaming a file) is passed as data_factory, a callable building a
+        fresh body for each attempt, instead of data.
         """
+        data_factory = kwargs.pop('data_factory', None)
         await self.ensure_authenticated()
         await self.ensure_session()
 
@@ -517,6 +534,8 @@ class AgiloftClient:
         logger.debug(f"{method.upper()} {url}")
 
         try:
+            if data_factory is not None:
+                kwargs['data'] = data_factory()
             async with self.session.request(method, url, **kwargs) as response:
                 response_text = await response.text()
 
@@ -536,8 +555,11 @@ class AgiloftClient:
                         else:
                             await self._authenticate()
 
-                    # Retry with new token
-                    kwargs['headers'] = self._get_auth_headers()
+                    # Retry with new token, keeping the per-call header
+                    # overrides (an upload must not go out as JSON)
+                    headers["Authorization"] = self._get_auth_headers()["Authorization"]
+                    if data_factory is not None:
+                        kwargs['data'] = data_factory()
                     async with self.session.request(method, url, **kwargs) as retry_response:
                         response_text = await retry_response.text()
                         if retry_response.status != 200:
@@ -616,12 +638,12 @@ class AgiloftClient:
     # --- Generic Entity Methods ---
 
     async def search_records(self, entity_path: str, query: str = "",
-                             fields: Optional[List[str]] = None,
+                             fields: Optional[Sequence[str]] = None,
                              limit: int = 500) -> List[Dict[str, Any]]:
         """Search records for any entity."""
         search_data = {"query": query}
         if fields:
-            search_data["field"] = fields
+            search_data["field"] = list(fields)
         response = await self._make_request(
             "POST", f"{entity_path}/search",
             json=search_data,
@@ -631,7 +653,7 @@ class AgiloftClient:
         return response.get('result', [])
 
     async def get_record(self, entity_path: str, record_id: int,
-                         fields: Optional[List[str]] = None) -> Dict[str, Any]:
+                         fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """Get a specific record by ID for any entity."""
         params = {}
         if fields:
@@ -681,24 +703,50 @@ class AgiloftClient:
 
     async def attach_file(self, entity_path: str, record_id: int,
                           field: str, file_name: str,
-                          file_data: bytes) -> Dict[str, Any]:
+                          file_data: Optional[bytes] = None,
+                          file_path: Optional[str] = None) -> Dict[str, Any]:
         """Attach a file to a record.
 
+        Pass either file_data (the file contents) or file_path (a local file).
+        A file_path is streamed to the request in chunks rather than loaded
+        into memory, and is reopened for each attempt because aiohttp closes
+        the file once it has been sent (e.g. before a retry after a 401).
+
         Uses a longer timeout (120s) than the default session timeout (30s)
         to accommodate large file uploads.
         """
-        form_data = aiohttp.FormData()
-        form_data.add_field('uploadFile', file_data, filename=file_name)
+        if (file_data is None) == (file_path is None):
+            raise ValueError("attach_file needs exactly one of file_data or file_path")
+        opened: List[BinaryIO] = []
+
+        def build_form() -> aiohttp.FormData:
+            value: Union[bytes, BinaryIO]
+            if file_path is not None:
+                value = open(file_path, "rb")
+                opened.append(value)
+            else:
+                value = file_data
+            form_data = aiohttp.FormData()
+            form_data.add_field(
+                'uploadFile', value, filename=file_name,
+                content_type='application/octet-stream',
+            )
+            return form_data
+
         params = {"field": field, "fileName": file_name}
         upload_timeout = aiohttp.ClientTimeout(total=120)
-        # Remove Content-Type to let aiohttp set multipart boundary
-        response = await self._make_request(
-            "POST", f"{entity_path}/attach/{record_id}",
-            params=params,
-            data=form_data,
-            headers={"Content-Type": None},
-            timeout=upload_timeout,
-        )
+        try:
+            # Remove Content-Type to let aiohttp set multipart boundary
+            response = await self._make_request(
+                "POST", f"{entity_path}/attach/{record_id}",
+                params=params,
+                data_factory=build_form,
+                headers={"Content-Type": None},
+                timeout=upload_timeout,
+            )
+        finally:
+            for file_obj in opened:
+                file_obj.close()
         return response
 
     async def retrieve_attachment(self, entity_path: str, record_id: int,
@@ -82,7 +82,9 @@ class Config:
                 "port": 8000,
                 "log_level": "INFO",
                 "timeout": 30,
-                "max_retries": 3
+                "max_retries": 3,
+                "cache_ttl": 0.0,
+                "compact_json": True
             }
         }
 
@@ -112,7 +114,9 @@ class Config:
             "MCP_SERVER_PORT": "server.port",
             "MCP_LOG_LEVEL": "server.log_level",
             "MCP_TIMEOUT": "server.timeout",
-            "MCP_MAX_RETRIES": "server.max_retries"
+            "MCP_MAX_RETRIES": "server.max_retries",
+            "MCP_CACHE_TTL": "server.cache_ttl",
+            "MCP_COMPACT_JSON": "server.compact_json"
         }
 
         for env_var, config_path in env_mappings.items():
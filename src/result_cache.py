@@ -0,0 +1,121 @@
+"""
+Result Cache
+
+A small time-to-live cache for read results (entity get/search and
+read-only workflows). Agents tend to re-read the same records within
+seconds; serving those repeats from memory saves a round trip to Agiloft.
+Entries expire after ``ttl`` seconds and the oldest entries are dropped
+once ``maxsize`` is reached. A ttl of 0 disables the cache.
+
+Also holds the in-flight request coalescing shared by the entity and
+workflow handlers.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire ``ttl`` seconds after insertion."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key. No-op while the cache is disabled."""
+        if not self.enabled:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def evict(self, group: Hashable) -> None:
+        """Drop every entry whose key tuple has group as its first element."""
+        for key in [k for k in self._data if k[0] == group]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Slow-changing reference tables (e.g. contract types) read by the workflow
+# handlers. Always on; entity writes to a table evict its entries.
+reference_cache = TTLCache(maxsize=256, ttl=60.0)
+
+# Results of get/search keyed by (entity_key, ...) and of read-only
+# workflows keyed by (WORKFLOW_CACHE_GROUP, ...). Disabled (ttl 0) until the
+# server calls configure_result_cache(); writes evict through invalidate_entity().
+result_cache = TTLCache(maxsize=1024, ttl=0.0)
+
+# Cache group for composite workflow reads. They span several tables, so a
+# write to any entity drops them all.
+WORKFLOW_CACHE_GROUP = "workflow"
+
+
+def configure_result_cache(ttl: float, maxsize: int = 1024) -> None:
+    """Set the read cache TTL in seconds (0 disables it) and clear it."""
+    result_cache.ttl = float(ttl)
+    result_cache.maxsize = maxsize
+    result_cache.clear()
+
+
+def invalidate_entity(entity_key: str) -> None:
+    """Drop cached reads for an entity after a write.
+
+    Called once the write has finished, successfully or not, so a read that
+    completes while the write is in flight cannot leave the old data cached.
+    """
+    result_cache.evict(entity_key)
+    result_cache.evict(WORKFLOW_CACHE_GROUP)
+    reference_cache.evict(entity_key)
+
+
+# --- In-flight read coalescing ---
+
+# Identical reads issued while one is already pending (common when an agent
+# fires parallel tool calls) share the pending request instead of making
+# another round trip. Entries live only until the request completes.
+_inflight: Dict[Tuple, "asyncio.Future"] = {}
+
+
+async def coalesce(key: Tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Await the pending request for key, starting it if none is in flight."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+
+        def _done(t):
+            if _inflight.get(key) is t:
+                del _inflight[key]
+            if not t.cancelled():
+                t.exception()  # mark retrieved even if every waiter went away
+
+        task.add_done_callback(_done)
+    # Shield so one caller being cancelled doesn't cancel the others' request.
+    return await asyncio.shield(task)
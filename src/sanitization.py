@@ -0,0 +1,25 @@
+"""
+Input Sanitization
+
+Helpers shared by the entity and workflow handlers for cleaning tool
+arguments before they are sent to Agiloft or used as local paths.
+"""
+
+from typing import Any, Dict
+
+# Paths from the desktop client's sandbox, not the machine this server runs on
+SANDBOX_PREFIXES = ("/mnt/", "/home/claude", "/tmp/sandbox", "/sandbox/")
+
+_EMPTY_VALUES = (None, "")
+
+
+def strip_empty_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove keys with empty/None values to avoid linked field validation errors.
+
+    Returns data itself when there is nothing to remove.
+    """
+    if not data:
+        return {}
+    if not any(v in _EMPTY_VALUES for v in data.values()):
+        return data
+    return {k: v for k, v in data.items() if v not in _EMPTY_VALUES}
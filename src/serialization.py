@@ -0,0 +1,73 @@
+"""
+Response Serialization
+
+JSON encoding for MCP tool responses. Uses orjson when it is installed
+(several times faster than the stdlib on large search results) and falls
+back to the standard json module otherwise. Output is either compact (the
+default, smaller on the wire and cheaper to encode) or 2-space indented.
+
+The two encoders agree on what tool responses contain: non-ASCII text is
+written as raw UTF-8 rather than \\u escapes, dates and times are written
+in ISO 8601 ("2026-01-31T09:30:00"), and other unknown types go through
+str(). They still differ on a few inputs tool responses don't
+normally contain. orjson writes NaN and Infinity as null, while the
+stdlib writes bare NaN/Infinity. orjson also serializes dataclasses and
+enums natively, where the stdlib falls back to str().
+"""
+
+import json
+from datetime import date, time
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode types JSON lacks: ISO 8601 for dates and times, str() otherwise."""
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    return str(obj)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = {
+        True: orjson.OPT_NON_STR_KEYS,
+        False: orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+    }
+
+# json.dumps builds a new JSONEncoder on every call when given non-default
+# options; build the fallback encoders once instead.
+_JSON_ENCODERS = {
+    True: json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default),
+    False: json.JSONEncoder(indent=2, ensure_ascii=False, default=_default),
+}
+
+_compact = True
+
+
+def set_compact(enabled: bool) -> None:
+    """Choose compact (True) or 2-space indented (False) output by default."""
+    global _compact
+    _compact = bool(enabled)
+
+
+def dumps(obj: Any, compact: Optional[bool] = None) -> str:
+    """Serialize a response payload to a JSON string.
+
+    compact overrides the module default set by set_compact().
+    """
+    if compact is None:
+        compact = _compact
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, option=_ORJSON_OPTIONS[compact], default=_default
+            ).decode("utf-8")
+        except TypeError:
+            # orjson rejects a few things json accepts (e.g. ints wider
+            # than 64 bits); let the stdlib handle those payloads.
+            pass
+    return _JSON_ENCODERS[compact].encode(obj)
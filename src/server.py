@@ -31,18 +31,22 @@ try:
     from .agiloft_client import AgiloftClient
     from .config import Config
     from .tool_generator import generate_tools
-    from .tool_handlers import dispatch_tool_call
+    from .tool_handlers import build_handler_table, dispatch_tool_call
+    from .result_cache import configure_result_cache
     from .prompt_registry import list_prompts as _list_prompts, get_prompt as _get_prompt
+    from .serialization import set_compact as _set_compact_json
     from .workflow_tools import generate_workflow_tools
-    from .workflow_handlers import dispatch_workflow_call
+    from .workflow_handlers import build_workflow_handler_table, dispatch_workflow_call
 except ImportError:
     from agiloft_client import AgiloftClient
     from config import Config
     from tool_generator import generate_tools
-    from tool_handlers import dispatch_tool_call
+    from tool_handlers import build_handler_table, dispatch_tool_call
+    from result_cache import configure_result_cache
     from prompt_registry import list_prompts as _list_prompts, get_prompt as _get_prompt
+    from serialization import set_compact as _set_compact_json
     from workflow_tools import generate_workflow_tools
-    from workflow_handlers import dispatch_workflow_call
+    from workflow_handlers import build_workflow_handler_table, dispatch_workflow_call
 
 # Configure logging to file (stderr is captured by Claude Desktop differently)
 import os as _os
@@ -70,14 +74,22 @@ if not config.validate():
 
 agiloft_client = AgiloftClient(config)
 
+# Short-lived cache for entity get/search results (0 disables it)
+configure_result_cache(config.get('server.cache_ttl', 0.0))
+
+# Compact JSON responses unless pretty-printing is requested
+_set_compact_json(config.get('server.compact_json', True))
+
 # Create the MCP server
 server = Server("agiloft-mcp-server")
 
 # Generate entity tools and dispatch map at startup
 _entity_tools, _entity_dispatch = generate_tools()
+_entity_handlers = build_handler_table(_entity_dispatch)
 
 # Generate workflow tools and dispatch map
 _workflow_tools, _workflow_dispatch = generate_workflow_tools()
+_workflow_handlers = build_workflow_handler_table(_workflow_dispatch)
 
 # Combined tool list
 _all_tools = _entity_tools + _workflow_tools
@@ -104,15 +116,15 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         await agiloft_client.ensure_authenticated()
 
         # Try workflow dispatch first (smaller set, fast lookup)
-        if name in _workflow_dispatch:
+        if name in _workflow_handlers:
             result = await dispatch_workflow_call(
-                name, arguments, agiloft_client, _workflow_dispatch
+                name, arguments, agiloft_client, _workflow_handlers
             )
             logger.info(f"call_tool: {name} completed successfully")
             return result
 
         # Fall through to entity dispatch
-        result = await dispatch_tool_call(name, arguments, agiloft_client, _entity_dispatch)
+        result = await dispatch_tool_call(name, arguments, agiloft_client, _entity_handlers)
         logger.info(f"call_tool: {name} completed successfully")
         return result
     except Exception as e:
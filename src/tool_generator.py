@@ -88,6 +88,10 @@ def _gen_search_tool(entity: EntityConfig) -> Tuple[Tool, str]:
                     "minimum": 1,
                     "maximum": 500,
                 },
+                "no_cache": {
+                    "type": "boolean",
+                    "description": "Bypass the short-lived read cache and query Agiloft directly",
+                },
             },
             "required": ["query"],
         },
@@ -113,6 +117,10 @@ def _gen_get_tool(entity: EntityConfig) -> Tuple[Tool, str]:
                     "items": {"type": "string"},
                     "description": "Specific fields to return. If omitted, returns all fields.",
                 },
+                "no_cache": {
+                    "type": "boolean",
+                    "description": "Bypass the short-lived read cache and query Agiloft directly",
+                },
             },
             "required": ["record_id"],
         },
@@ -5,37 +5,68 @@ Generic handlers for all entity tool calls. Each handler receives an
 EntityConfig, arguments dict, and AgiloftClient, and returns MCP TextContent.
 
 The dispatch_tool_call function routes tool names to the correct handler
-using the dispatch map from tool_generator.
+using the table build_handler_table() makes from tool_generator's
+dispatch map.
 """
 
-import base64
-import json
+import asyncio
+import functools
 import logging
 import os
 import re
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from mcp.types import TextContent
 
+# pybase64 is a SIMD-accelerated drop-in for the stdlib decoder; large
+# attachments decode several times faster when it is installed.
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
 # Handle both direct execution and package imports
 try:
     from .agiloft_client import AgiloftClient
     from .entity_registry import EntityConfig, get_entity
+    from .result_cache import coalesce, invalidate_entity, result_cache
+    from .sanitization import SANDBOX_PREFIXES, strip_empty_values
+    from .serialization import dumps
 except ImportError:
     from agiloft_client import AgiloftClient
     from entity_registry import EntityConfig, get_entity
+    from result_cache import coalesce, invalidate_entity, result_cache
+    from sanitization import SANDBOX_PREFIXES, strip_empty_values
+    from serialization import dumps
 
 logger = logging.getLogger(__name__)
 
 
 # --- Query sanitization (fixes SQL injection vulnerability) ---
 
+# A quote, or a run of '-'/';' that contains a ';' or at least two dashes.
+# Matching whole runs means removing ';' can never splice a new '--' together
+# (e.g. "-;-"), which separate replace passes would miss.
+_SANITIZE_RE = re.compile(r"'|[-;]*;[-;]*|-{2,}")
+
+
+def _sanitize_match(match: "re.Match[str]") -> str:
+    token = match.group(0)
+    if token == "'":
+        return "''"
+    # Keep a lone hyphen (e.g. "Smith-;Jones" -> "Smith-Jones"), drop comments
+    return "-" if token.count("-") == 1 else ""
+
+
+@functools.lru_cache(maxsize=1024)
 def _sanitize_query_value(value: str) -> str:
-    """Escape special characters in query values to prevent injection."""
-    sanitized = value.replace("'", "''")
-    sanitized = sanitized.replace("--", "")
-    sanitized = sanitized.replace(";", "")
-    return sanitized
+    """Escape special characters in query values to prevent injection.
+
+    Single regex pass: quotes are doubled, ``;`` is dropped, and any ``--``
+    comment marker is removed, including ones formed once ``;`` is stripped.
+    Cached because agents tend to repeat the same search text across calls.
+    """
+    return _SANITIZE_RE.sub(_sanitize_match, value)
 
 
 def _is_structured_query(query: str) -> bool:
@@ -52,9 +83,14 @@ def _is_structured_query(query: str) -> bool:
 
 # --- Response formatting ---
 
-def _format_response(operation: str, entity: EntityConfig, data: Any,
-                     record_id: int = None) -> List[TextContent]:
-    """Format a standardized success response."""
+# Result lists longer than this are serialized in a worker thread so a big
+# search doesn't stall the event loop for other in-flight tool calls.
+_OFFLOAD_SERIALIZATION_THRESHOLD = 200
+
+
+def _success_payload(operation: str, entity: EntityConfig, data: Any,
+                     record_id: int = None,
+                     warnings: Optional[List[str]] = None) -> Dict[str, Any]:
     result: Dict[str, Any] = {
         "success": True,
         "operation": operation,
@@ -65,13 +101,40 @@ def _format_response(operation: str, entity: EntityConfig, data: Any,
     if isinstance(data, list):
         result["count"] = len(data)
     result["data"] = data
+    if warnings:
+        result["partial"] = True
+        result["warnings"] = warnings
+    return result
+
 
+def _format_response(operation: str, entity: EntityConfig, data: Any,
+                     record_id: int = None,
+                     warnings: Optional[List[str]] = None) -> List[TextContent]:
+    """Format a standardized success response.
+
+    warnings marks the data as partial (e.g. some search queries failed)
+    and tells the caller what is missing.
+    """
     return [TextContent(
         type="text",
-        text=json.dumps(result, indent=2, default=str),
+        text=dumps(_success_payload(operation, entity, data, record_id, warnings)),
     )]
 
 
+async def _format_response_async(operation: str, entity: EntityConfig, data: Any,
+                                 record_id: int = None,
+                                 warnings: Optional[List[str]] = None) -> List[TextContent]:
+    """Like _format_response, but serializes large result lists off the event loop."""
+    if not isinstance(data, list) or len(data) <= _OFFLOAD_SERIALIZATION_THRESHOLD:
+        return _format_response(operation, entity, data, record_id, warnings)
+
+    # run_in_executor rather than asyncio.to_thread: the server supports 3.8
+    text = await asyncio.get_running_loop().run_in_executor(
+        None, dumps, _success_payload(operation, entity, data, record_id, warnings)
+    )
+    return [TextContent(type="text", text=text)]
+
+
 def _format_error(operation: str, entity: EntityConfig, error: str,
                   record_id: int = None) -> List[TextContent]:
     """Format a standardized error response."""
@@ -86,10 +149,25 @@ def _format_error(operation: str, entity: EntityConfig, error: str,
 
     return [TextContent(
         type="text",
-        text=json.dumps(result, indent=2, default=str),
+        text=dumps(result),
     )]
 
 
+# --- In-flight read coalescing ---
+
+def _fields_key(fields):
+    return tuple(fields) if fields else None
+
+
+def _search_records(client: AgiloftClient, api_path: str, query: str,
+                    fields, limit: int) -> Awaitable[List[Dict[str, Any]]]:
+    """Coalesced client.search_records."""
+    key = (id(client), "search", api_path, query, _fields_key(fields), limit)
+    return coalesce(
+        key, lambda: client.search_records(api_path, query, fields, limit=limit)
+    )
+
+
 # --- Individual operation handlers ---
 
 async def handle_search(entity: EntityConfig, arguments: Dict[str, Any],
@@ -99,32 +177,67 @@ async def handle_search(entity: EntityConfig, arguments: Dict[str, Any],
     fields = arguments.get("fields", entity.default_search_fields)
     limit = arguments.get("limit", 50)
 
+    cache_key = (entity.key, "search", query, _fields_key(fields), limit)
+    if not arguments.get("no_cache"):
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return await _format_response_async("search", entity, cached)
+
+    warnings: List[str] = []
     try:
         if _is_structured_query(query):
             # Structured query: pass through as-is
-            results = await client.search_records(entity.api_path, query, fields, limit=limit)
+            results = await _search_records(client, entity.api_path, query, fields, limit)
         elif entity.text_search_fields and query.strip():
             # Text search: query each text field with ~= and merge results
             # (Agiloft doesn't support OR across different fields with ~=)
+            # Fields are queried concurrently; a failing field is skipped and
+            # reported in the response's warnings unless every field fails.
             sanitized = _sanitize_query_value(query)
+            all_results = await asyncio.gather(
+                *(
+                    _search_records(
+                        client, entity.api_path, f"{text_field}~='{sanitized}'",
+                        fields, limit,
+                    )
+                    for text_field in entity.text_search_fields
+                ),
+                return_exceptions=True,
+            )
+            errors = [r for r in all_results if isinstance(r, Exception)]
+            if len(errors) == len(all_results):
+                raise errors[0]
+
             seen_ids = set()
             results = []
-            for text_field in entity.text_search_fields:
-                field_query = f"{text_field}~='{sanitized}'"
-                field_results = await client.search_records(
-                    entity.api_path, field_query, fields, limit=limit
-                )
+            for text_field, field_results in zip(entity.text_search_fields, all_results):
+                if isinstance(field_results, Exception):
+                    logger.warning(
+                        f"search {entity.key}: text field '{text_field}' failed: {field_results}"
+                    )
+                    warnings.append(
+                        f"Search on field '{text_field}' failed, so results may be "
+                        f"incomplete: {field_results}"
+                    )
+                    continue
                 for record in field_results:
                     rid = record.get("id")
                     if rid not in seen_ids:
                         seen_ids.add(rid)
                         results.append(record)
+                        if len(results) >= limit:
+                            break
+                if len(results) >= limit:
+                    break
         else:
-            results = await client.search_records(entity.api_path, query, fields, limit=limit)
+            results = await _search_records(client, entity.api_path, query, fields, limit)
 
         if isinstance(results, list) and len(results) > limit:
             results = results[:limit]
-        return _format_response("search", entity, results)
+        # A partial result would be served as complete for the whole TTL
+        if not warnings:
+            result_cache.set(cache_key, results)
+        return await _format_response_async("search", entity, results, warnings=warnings)
     except Exception as e:
         return _format_error("search", entity, str(e))
 
@@ -135,41 +248,50 @@ async def handle_get(entity: EntityConfig, arguments: Dict[str, Any],
     record_id = arguments.get("record_id")
     fields = arguments.get("fields")
 
+    cache_key = (entity.key, "get", record_id, _fields_key(fields))
+    if not arguments.get("no_cache"):
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return _format_response("get", entity, cached, record_id)
+
     try:
-        record = await client.get_record(entity.api_path, record_id, fields)
+        key = (id(client), "get", entity.api_path, record_id, _fields_key(fields))
+        record = await coalesce(
+            key, lambda: client.get_record(entity.api_path, record_id, fields)
+        )
+        result_cache.set(cache_key, record)
         return _format_response("get", entity, record, record_id)
     except Exception as e:
         return _format_error("get", entity, str(e), record_id)
 
 
-def _strip_empty_values(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Remove keys with empty/None values to avoid linked field validation errors."""
-    return {k: v for k, v in data.items() if v is not None and v != ""}
-
-
 async def handle_create(entity: EntityConfig, arguments: Dict[str, Any],
                         client: AgiloftClient) -> List[TextContent]:
     """Handle create requests for any entity."""
-    data = _strip_empty_values(arguments.get("data", {}))
+    data = strip_empty_values(arguments.get("data", {}))
 
     try:
         result = await client.create_record(entity.api_path, data)
         return _format_response("create", entity, result)
     except Exception as e:
         return _format_error("create", entity, str(e))
+    finally:
+        invalidate_entity(entity.key)
 
 
 async def handle_update(entity: EntityConfig, arguments: Dict[str, Any],
                         client: AgiloftClient) -> List[TextContent]:
     """Handle update requests for any entity."""
     record_id = arguments.get("record_id")
-    data = _strip_empty_values(arguments.get("data", {}))
+    data = strip_empty_values(arguments.get("data", {}))
 
     try:
         result = await client.update_record(entity.api_path, record_id, data)
         return _format_response("update", entity, result, record_id)
     except Exception as e:
         return _format_error("update", entity, str(e), record_id)
+    finally:
+        invalidate_entity(entity.key)
 
 
 async def handle_delete(entity: EntityConfig, arguments: Dict[str, Any],
@@ -183,19 +305,23 @@ async def handle_delete(entity: EntityConfig, arguments: Dict[str, Any],
         return _format_response("delete", entity, result, record_id)
     except Exception as e:
         return _format_error("delete", entity, str(e), record_id)
+    finally:
+        invalidate_entity(entity.key)
 
 
 async def handle_upsert(entity: EntityConfig, arguments: Dict[str, Any],
                         client: AgiloftClient) -> List[TextContent]:
     """Handle upsert (insert or update) requests for any entity."""
     query = arguments.get("query", "")
-    data = _strip_empty_values(arguments.get("data", {}))
+    data = strip_empty_values(arguments.get("data", {}))
 
     try:
         result = await client.upsert_record(entity.api_path, query, data)
         return _format_response("upsert", entity, result)
     except Exception as e:
         return _format_error("upsert", entity, str(e))
+    finally:
+        invalidate_entity(entity.key)
 
 
 async def handle_attach_file(entity: EntityConfig, arguments: Dict[str, Any],
@@ -207,9 +333,11 @@ async def handle_attach_file(entity: EntityConfig, arguments: Dict[str, Any],
     file_content_b64 = arguments.get("file_content_base64", "")
 
     try:
-        file_data = base64.b64decode(file_content_b64)
+        file_data = b64decode(file_content_b64)
     except Exception as e:
         return _format_error("attach_file", entity, f"Invalid base64 content: {e}", record_id)
+    finally:
+        del file_content_b64
 
     try:
         result = await client.attach_file(
@@ -218,6 +346,8 @@ async def handle_attach_file(entity: EntityConfig, arguments: Dict[str, Any],
         return _format_response("attach_file", entity, result, record_id)
     except Exception as e:
         return _format_error("attach_file", entity, str(e), record_id)
+    finally:
+        invalidate_entity(entity.key)
 
 
 async def handle_retrieve_attachment(entity: EntityConfig, arguments: Dict[str, Any],
@@ -234,8 +364,7 @@ async def handle_retrieve_attachment(entity: EntityConfig, arguments: Dict[str,
 
     # Reject sandbox paths that Claude Desktop may hallucinate
     if save_dir:
-        _sandbox_prefixes = ("/mnt/", "/home/claude", "/tmp/sandbox", "/sandbox/")
-        if any(save_dir.startswith(p) for p in _sandbox_prefixes):
+        if save_dir.startswith(SANDBOX_PREFIXES):
             return _format_error(
                 "retrieve_attachment", entity,
                 f"'{save_dir}' is a sandbox path, not a real filesystem path. "
@@ -270,6 +399,8 @@ async def handle_remove_attachment(entity: EntityConfig, arguments: Dict[str, An
         return _format_response("remove_attachment", entity, result, record_id)
     except Exception as e:
         return _format_error("remove_attachment", entity, str(e), record_id)
+    finally:
+        invalidate_entity(entity.key)
 
 
 async def handle_attachment_info(entity: EntityConfig, arguments: Dict[str, Any],
@@ -298,6 +429,8 @@ async def handle_action_button(entity: EntityConfig, arguments: Dict[str, Any],
         return _format_response("action_button", entity, result, record_id)
     except Exception as e:
         return _format_error("action_button", entity, str(e), record_id)
+    finally:
+        invalidate_entity(entity.key)
 
 
 async def handle_evaluate_format(entity: EntityConfig, arguments: Dict[str, Any],
@@ -331,25 +464,43 @@ HANDLER_DISPATCH = {
 }
 
 
+Handler = Callable[[EntityConfig, Dict[str, Any], AgiloftClient], Awaitable[List[TextContent]]]
+
+
+def _resolve_handler(entity_key: str, action: str) -> Tuple[EntityConfig, Handler]:
+    """Resolve (entity_key, action) to (EntityConfig, handler)."""
+    entity = get_entity(entity_key)
+
+    handler = HANDLER_DISPATCH.get(action)
+    if not handler:
+        raise ValueError(f"Unknown action: {action}")
+
+    return entity, handler
+
+
+def build_handler_table(tool_dispatch: Dict[str, tuple]) -> Dict[str, Tuple[EntityConfig, Handler]]:
+    """Resolve a generate_tools() dispatch map into tool_name -> (EntityConfig, handler).
+
+    Built once at startup so each call is a single dict lookup. Raises
+    ValueError for any entry with an unknown entity or action.
+    """
+    return {name: _resolve_handler(*target) for name, target in tool_dispatch.items()}
+
+
 async def dispatch_tool_call(name: str, arguments: Dict[str, Any],
                              client: AgiloftClient,
-                             tool_dispatch: Dict[str, tuple]) -> List[TextContent]:
+                             handler_table: Dict[str, Tuple[EntityConfig, Handler]]) -> List[TextContent]:
     """Dispatch a tool call to the appropriate handler.
 
     Args:
         name: Tool name (e.g., "agiloft_search_contracts")
         arguments: Tool arguments from MCP
         client: AgiloftClient instance
-        tool_dispatch: Mapping of tool_name -> (entity_key, action) from generate_tools()
+        handler_table: The table from build_handler_table()
     """
-    if name not in tool_dispatch:
-        raise ValueError(f"Unknown tool: {name}")
-
-    entity_key, action = tool_dispatch[name]
-    entity = get_entity(entity_key)
-
-    handler = HANDLER_DISPATCH.get(action)
-    if not handler:
-        raise ValueError(f"Unknown action: {action}")
+    try:
+        entity, handler = handler_table[name]
+    except KeyError:
+        raise ValueError(f"Unknown tool: {name}") from None
 
     return await handler(entity, arguments, client)
@@ -7,18 +7,31 @@ makes the necessary API calls, and returns enriched responses with
 next_steps guidance.
 """
 
+import asyncio
+import functools
 import json
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
 from mcp.types import TextContent
 
 # Handle both direct execution and package imports
 try:
     from .agiloft_client import AgiloftClient
+    from .result_cache import (
+        WORKFLOW_CACHE_GROUP, coalesce, invalidate_entity, reference_cache, result_cache,
+    )
+    from .sanitization import SANDBOX_PREFIXES, strip_empty_values
+    from .serialization import dumps
 except ImportError:
     from agiloft_client import AgiloftClient
+    from result_cache import (
+        WORKFLOW_CACHE_GROUP, coalesce, invalidate_entity, reference_cache, result_cache,
+    )
+    from sanitization import SANDBOX_PREFIXES, strip_empty_values
+    from serialization import dumps
 
 logger = logging.getLogger(__name__)
 
@@ -30,32 +43,150 @@ CONTRACT_LINKED_FIELDS = {
     "internal_contract_owner",
 }
 
-
-def _ensure_linked_prefix(data: Dict[str, Any], linked_fields: set) -> Dict[str, Any]:
+# Field lists and filters reused across handlers, built once at import.
+_ACTIVE_TYPE_FILTER = "status=Active"
+_CONTRACT_TYPE_BRIEF_FIELDS = ("id", "contract_type", "party_type")
+_CONTRACT_TYPE_LIST_FIELDS = _CONTRACT_TYPE_BRIEF_FIELDS + (
+    "description", "default_contract_term_in_months", "default_autorenewal_term_in_months",
+)
+_CONTRACT_TYPE_FIELDS = _CONTRACT_TYPE_LIST_FIELDS + ("available_for_record_types",)
+_COMPANY_FIELDS = ("id", "company_name", "type_of_company", "status")
+_COMPANY_SUMMARY_FIELDS = _COMPANY_FIELDS + (
+    "industry", "main_city", "country", "number_of_active_contracts",
+)
+_CONTRACT_TITLE_FIELDS = ("id", "contract_title1")
+_CONTRACT_SUMMARY_FIELDS = (
+    "id", "record_type", "contract_title1", "company_name",
+    "contract_type", "contract_amount", "contract_start_date",
+    "contract_end_date", "contract_term_in_months", "wfstate",
+    "internal_contract_owner", "date_signed", "confidential",
+    "auto_renewal_term_in_months", "evaluation_frequency",
+    "contract_description", "contract_comments", "cost_center",
+)
+_EXPIRING_CONTRACT_FIELDS = (
+    "id", "contract_title1", "company_name", "contract_type",
+    "contract_end_date", "contract_amount", "wfstate",
+    "auto_renewal_term_in_months", "internal_contract_owner",
+)
+_ATTACHMENT_FIELDS = ("id", "title", "status", "attached_file")
+
+
+def _ensure_linked_prefix(data: Dict[str, Any], linked_fields: set,
+                          inplace: bool = False) -> Dict[str, Any]:
     """Add colon prefix to linked field values if not already present.
 
     Agiloft linked fields require values to start with ':' (e.g. ':Acme Corp').
     This helper ensures the prefix is always present for known linked fields.
+    Returns data itself when nothing needs prefixing; otherwise a copy, or
+    data updated in place when inplace is True.
     """
-    result = dict(data)
-    for field_name in linked_fields:
-        value = result.get(field_name)
-        if isinstance(value, str) and value and not value.startswith(":"):
-            result[field_name] = f":{value}"
+    result = data
+    for field_name in linked_fields.intersection(data):
+        value = data[field_name]
+        # Values come straight from decoded JSON, so an exact type check is
+        # enough; the length test guards the value[0] index.
+        if type(value) is str and value and value[0] != ":":
+            if result is data and not inplace:
+                result = dict(data)
+            result[field_name] = ":" + value
     return result
 
 
+# Values interpolated into quoted query literals only have ' doubled. Unlike
+# the entity search sanitizer, ';' and '--' are kept, because these are exact
+# record values such as company names. str.translate does it in one C pass.
+_QUOTE_ESCAPE = str.maketrans({"'": "''"})
+
+
+def _q(value: Any) -> str:
+    """Escape a value for use inside a '...' Agiloft query literal."""
+    return str(value).translate(_QUOTE_ESCAPE)
+
+
+def _parse_date(value: Any) -> datetime:
+    """Parse the YYYY-MM-DD prefix of an Agiloft date/datetime value.
+
+    datetime.fromisoformat is a C fast path (several times quicker than
+    strptime); strptime is kept as a fallback for loosely formatted values
+    such as '2024-1-5'. Raises ValueError if neither can parse it.
+    """
+    text = str(value)[:10]
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return datetime.strptime(text, "%Y-%m-%d")
+
+
+async def _gather_or_cancel(*aws):
+    """asyncio.gather that cancels the other awaitables if one fails.
+
+    Same failure semantics as asyncio.TaskGroup (3.11+) without requiring
+    it: a failed lookup doesn't leave its siblings running for nothing.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+# Per-key locks so concurrent cache misses make one request, not one each.
+_reference_locks: Dict[Tuple, asyncio.Lock] = {}
+
+
+async def _cached_contract_type_search(
+    client: AgiloftClient, query: str, fields: Sequence[str],
+) -> List[Dict[str, Any]]:
+    """search_records on /contract_type, memoized in the reference cache.
+
+    Contract types change rarely, so repeated preflights within the cache
+    TTL reuse the previous answer. Writes through the contract_type entity
+    tools evict these entries.
+    """
+    key = ("contract_type", id(client), query, fields)
+    cached = reference_cache.get(key)
+    if cached is not None:
+        return cached
+
+    lock = _reference_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = reference_cache.get(key)
+            if cached is None:
+                cached = await client.search_records("/contract_type", query, fields)
+                reference_cache.set(key, cached)
+    finally:
+        if not lock.locked():
+            _reference_locks.pop(key, None)
+    return cached
+
+
 # ---------------------------------------------------------------------------
 # Response helpers
 # ---------------------------------------------------------------------------
 
+class _SuccessResponse(list):
+    """List[TextContent] built by _workflow_response.
+
+    Lets _cached_workflow tell successes from errors without decoding the
+    serialized JSON again.
+    """
+
+
 def _workflow_response(
     operation: str,
     data: Any,
     next_steps: Optional[List[str]] = None,
     warnings: Optional[List[str]] = None,
+    hint_size: str = "small",
 ) -> List[TextContent]:
-    """Build an enriched workflow response with guidance."""
+    """Build an enriched workflow response with guidance.
+
+    hint_size="large" marks handlers that can return many records; those are
+    always encoded compactly, even when pretty-printing is configured.
+    """
     result: Dict[str, Any] = {
         "success": True,
         "operation": operation,
@@ -66,10 +197,10 @@ def _workflow_response(
     if warnings:
         result["warnings"] = warnings
 
-    return [TextContent(
+    return _SuccessResponse([TextContent(
         type="text",
-        text=json.dumps(result, indent=2, default=str),
-    )]
+        text=dumps(result, compact=True if hint_size == "large" else None),
+    )])
 
 
 def _workflow_error(
@@ -88,14 +219,65 @@ def _workflow_error(
 
     return [TextContent(
         type="text",
-        text=json.dumps(result, indent=2, default=str),
+        text=dumps(result),
     )]
 
 
+def _cached_workflow(operation: str):
+    """Share and cache the results of a read-only workflow.
+
+    Identical calls made while one is running await that one instead of
+    repeating its API calls. Successful responses are also kept in the
+    result cache under the same TTL as entity get/search (server.cache_ttl,
+    off by default); any write through an entity or workflow tool drops them.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(arguments: Dict[str, Any], client: AgiloftClient) -> List[TextContent]:
+            cache_key = (
+                WORKFLOW_CACHE_GROUP, operation,
+                json.dumps(arguments, sort_keys=True, default=str),
+            )
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            async def run() -> List[TextContent]:
+                response = await handler(arguments, client)
+                if isinstance(response, _SuccessResponse):
+                    result_cache.set(cache_key, response)
+                return response
+
+            return await coalesce((id(client),) + cache_key, run)
+        return wrapper
+    return decorator
+
+
+def _invalidate_entities(*entity_keys: str) -> None:
+    """Drop cached reads for the tables a workflow writes to."""
+    for key in entity_keys:
+        invalidate_entity(key)
+
+
 # ---------------------------------------------------------------------------
 # Handler: preflight_create_contract
 # ---------------------------------------------------------------------------
 
+# Static parts of a successful preflight response
+_REQUIRED_CONTRACT_FIELDS = {
+    "record_type": "Contract, Child Contract, or Amendment",
+    "auto_renewal_term_in_months": "integer",
+    "confidential": "string",
+    "evaluation_frequency": "integer",
+}
+_LINKED_FIELDS_WARNING = (
+    "CRITICAL: The following fields are LINKED FIELDS and their values "
+    "MUST start with a colon (:) prefix when creating or updating. "
+    "Without the colon prefix, the API will reject the value or fail silently."
+)
+
+
+@_cached_workflow("preflight_create_contract")
 async def handle_preflight_create_contract(
     arguments: Dict[str, Any], client: AgiloftClient
 ) -> List[TextContent]:
@@ -112,11 +294,8 @@ async def handle_preflight_create_contract(
         # Step 1: Contract type validation
         if not contract_type_name:
             # Return all active contract types for selection
-            types = await client.search_records(
-                "/contract_type",
-                "status=Active",
-                ["id", "contract_type", "party_type", "description",
-                 "default_contract_term_in_months", "default_autorenewal_term_in_months"],
+            types = await _cached_contract_type_search(
+                client, _ACTIVE_TYPE_FILTER, _CONTRACT_TYPE_LIST_FIELDS,
             )
             data["available_contract_types"] = types
             data["ready_to_create"] = False
@@ -129,14 +308,20 @@ async def handle_preflight_create_contract(
                 next_steps=next_steps, warnings=warnings,
             )
 
-        # Validate specific contract type exists and is active
-        type_query = f"contract_type='{contract_type_name}' AND status=Active"
-        type_results = await client.search_records(
-            "/contract_type", type_query,
-            ["id", "contract_type", "party_type", "description",
-             "default_contract_term_in_months", "default_autorenewal_term_in_months",
-             "available_for_record_types"],
+        # Validate specific contract type exists and is active. The company
+        # lookup doesn't depend on the type, so both run concurrently.
+        type_query = f"contract_type='{_q(contract_type_name)}' AND {_ACTIVE_TYPE_FILTER}"
+        type_lookup = _cached_contract_type_search(
+            client, type_query, _CONTRACT_TYPE_FIELDS,
         )
+        if company_name:
+            company_query = f"company_name~='{_q(company_name)}'"
+            type_results, company_results = await _gather_or_cancel(
+                type_lookup,
+                client.search_records("/company", company_query, _COMPANY_FIELDS),
+            )
+        else:
+            type_results = await type_lookup
 
         if not type_results:
             data["ready_to_create"] = False
@@ -144,9 +329,8 @@ async def handle_preflight_create_contract(
                 f"Contract type '{contract_type_name}' not found or not active."
             )
             # Fetch active types as fallback
-            active_types = await client.search_records(
-                "/contract_type", "status=Active",
-                ["id", "contract_type", "party_type"],
+            active_types = await _cached_contract_type_search(
+                client, _ACTIVE_TYPE_FILTER, _CONTRACT_TYPE_BRIEF_FIELDS,
             )
             data["available_contract_types"] = active_types
             next_steps.append("Choose from the available active contract types.")
@@ -160,12 +344,6 @@ async def handle_preflight_create_contract(
 
         # Step 2: Company validation
         if company_name:
-            company_query = f"company_name~='{company_name}'"
-            company_results = await client.search_records(
-                "/company", company_query,
-                ["id", "company_name", "type_of_company", "status"],
-            )
-
             if not company_results:
                 ready_to_create = False
                 warnings.append(
@@ -200,21 +378,14 @@ async def handle_preflight_create_contract(
 
         # Step 3: Required fields reminder
         data["required_fields"] = {
-            "record_type": "Contract, Child Contract, or Amendment",
-            "auto_renewal_term_in_months": "integer",
-            "confidential": "string",
-            "evaluation_frequency": "integer",
+            **_REQUIRED_CONTRACT_FIELDS,
             "contract_type": f":{contract_type_name}",
         }
         if company_name and data.get("company"):
             data["required_fields"]["company_name"] = f":{company_name}"
 
         # CRITICAL: Linked field colon prefix reminder
-        data["linked_fields_warning"] = (
-            "CRITICAL: The following fields are LINKED FIELDS and their values "
-            "MUST start with a colon (:) prefix when creating or updating. "
-            "Without the colon prefix, the API will reject the value or fail silently."
-        )
+        data["linked_fields_warning"] = _LINKED_FIELDS_WARNING
         data["linked_fields"] = {
             "contract_type": f":{contract_type_name}",
             "company_name": f":{company_name}" if company_name else "(provide company name with : prefix)",
@@ -260,10 +431,9 @@ async def handle_create_contract_with_company(
 
     try:
         # Step 1: Find or create company
-        company_query = f"company_name='{company_name}'"
+        company_query = f"company_name='{_q(company_name)}'"
         company_results = await client.search_records(
-            "/company", company_query,
-            ["id", "company_name", "type_of_company", "status"],
+            "/company", company_query, _COMPANY_FIELDS,
         )
 
         if company_results:
@@ -271,9 +441,7 @@ async def handle_create_contract_with_company(
             data["company_action"] = "found_existing"
         elif create_if_missing:
             # Create the company
-            create_data = {**company_data, "company_name": company_name}
-            # Strip empty values
-            create_data = {k: v for k, v in create_data.items() if v is not None and v != ""}
+            create_data = strip_empty_values({**company_data, "company_name": company_name})
             company_result = await client.create_record("/company", create_data)
             data["company"] = company_result
             data["company_action"] = "created_new"
@@ -287,9 +455,10 @@ async def handle_create_contract_with_company(
         # Step 2: Create the contract with company linked
         contract_data["company_name"] = f":{company_name}"
         # Auto-prefix linked fields (contract_type, internal_contract_owner, etc.)
-        contract_data = _ensure_linked_prefix(contract_data, CONTRACT_LINKED_FIELDS)
-        # Strip empty values
-        contract_data = {k: v for k, v in contract_data.items() if v is not None and v != ""}
+        contract_data = _ensure_linked_prefix(
+            contract_data, CONTRACT_LINKED_FIELDS, inplace=True,
+        )
+        contract_data = strip_empty_values(contract_data)
         contract_result = await client.create_record("/contract", contract_data)
         data["contract"] = contract_result
 
@@ -309,12 +478,15 @@ async def handle_create_contract_with_company(
             "create_contract_with_company", str(e),
             partial_data=data if data else None,
         )
+    finally:
+        _invalidate_entities("company", "contract")
 
 
 # ---------------------------------------------------------------------------
 # Handler: get_contract_summary
 # ---------------------------------------------------------------------------
 
+@_cached_workflow("get_contract_summary")
 async def handle_get_contract_summary(
     arguments: Dict[str, Any], client: AgiloftClient
 ) -> List[TextContent]:
@@ -326,49 +498,50 @@ async def handle_get_contract_summary(
     next_steps: List[str] = []
 
     try:
-        # Step 1: Get contract details
-        contract = await client.get_record(
-            "/contract", contract_id,
-            [
-                "id", "record_type", "contract_title1", "company_name",
-                "contract_type", "contract_amount", "contract_start_date",
-                "contract_end_date", "contract_term_in_months", "wfstate",
-                "internal_contract_owner", "date_signed", "confidential",
-                "auto_renewal_term_in_months", "evaluation_frequency",
-                "contract_description", "contract_comments", "cost_center",
-            ],
-        )
-        data["contract"] = contract
+        # Attachments are looked up by contract_id alone, so start that search
+        # now and let it run while the contract and company are fetched.
+        attach_task = asyncio.ensure_future(client.search_records(
+            "/attachment", f"contract_id='{_q(contract_id)}'", _ATTACHMENT_FIELDS,
+        ))
 
-        # Step 2: Get company details if company_name present
-        company_name = contract.get("company_name", "")
-        if company_name:
-            # Remove colon prefix if present
-            clean_name = company_name.lstrip(":")
-            try:
-                company_results = await client.search_records(
-                    "/company", f"company_name='{clean_name}'",
-                    ["id", "company_name", "type_of_company", "status",
-                     "industry", "main_city", "country",
-                     "number_of_active_contracts"],
-                )
-                if company_results:
-                    data["company"] = company_results[0]
-            except Exception as e:
-                warnings.append(f"Could not fetch company details: {e}")
-
-        # Step 3: Check attachments (via Attachment entity, not contract table)
         try:
-            attach_results = await client.search_records(
-                "/attachment", f"contract_id='{contract_id}'",
-                ["id", "title", "status", "attached_file"],
+            # Step 1: Get contract details
+            contract = await client.get_record(
+                "/contract", contract_id, _CONTRACT_SUMMARY_FIELDS,
             )
-            data["attachments"] = {
-                "count": len(attach_results),
-                "records": attach_results,
-            }
-        except Exception:
-            data["attachments"] = {"count": 0, "records": [], "note": "Could not search attachments"}
+            data["contract"] = contract
+
+            # Step 2: Get company details if company_name present
+            company_name = contract.get("company_name", "")
+            if company_name:
+                # Remove colon prefix if present
+                clean_name = company_name.lstrip(":")
+                try:
+                    company_results = await client.search_records(
+                        "/company", f"company_name='{_q(clean_name)}'",
+                        _COMPANY_SUMMARY_FIELDS,
+                    )
+                    if company_results:
+                        data["company"] = company_results[0]
+                except Exception as e:
+                    warnings.append(f"Could not fetch company details: {e}")
+
+            # Step 3: Check attachments (via Attachment entity, not contract table)
+            try:
+                attach_results = await attach_task
+                data["attachments"] = {
+                    "count": len(attach_results),
+                    "records": attach_results,
+                }
+            except Exception:
+                data["attachments"] = {"count": 0, "records": [], "note": "Could not search attachments"}
+        finally:
+            # Don't leave the attachment search running, or its error
+            # unretrieved, if a step failed or the call was cancelled.
+            if not attach_task.done():
+                attach_task.cancel()
+            elif not attach_task.cancelled():
+                attach_task.exception()
 
         # Step 4: Health checks
         health_issues: List[str] = []
@@ -377,7 +550,7 @@ async def handle_get_contract_summary(
         end_date_str = contract.get("contract_end_date", "")
         if end_date_str:
             try:
-                end_date = datetime.strptime(str(end_date_str)[:10], "%Y-%m-%d")
+                end_date = _parse_date(end_date_str)
                 days_remaining = (end_date - datetime.now()).days
                 if days_remaining < 0:
                     health_issues.append(
@@ -422,7 +595,7 @@ async def handle_get_contract_summary(
 
         return _workflow_response(
             "get_contract_summary", data,
-            next_steps=next_steps, warnings=warnings,
+            next_steps=next_steps, warnings=warnings, hint_size="large",
         )
 
     except Exception as e:
@@ -436,6 +609,21 @@ async def handle_get_contract_summary(
 # Handler: find_expiring_contracts
 # ---------------------------------------------------------------------------
 
+_DATE_FMT = "%Y-%m-%d"
+
+
+def _build_expiring_query(now: str, future: str, include_expired: bool,
+                          status_filter: str) -> str:
+    """Build the contract_end_date range query (dates as YYYY-MM-DD)."""
+    clauses = [f"contract_end_date<='{future}'"]
+    if not include_expired:
+        clauses.insert(0, f"contract_end_date>='{now}'")
+    if status_filter:
+        clauses.append(f"wfstate='{_q(status_filter)}'")
+    return " AND ".join(clauses)
+
+
+@_cached_workflow("find_expiring_contracts")
 async def handle_find_expiring_contracts(
     arguments: Dict[str, Any], client: AgiloftClient
 ) -> List[TextContent]:
@@ -452,26 +640,13 @@ async def handle_find_expiring_contracts(
         now = datetime.now()
         future_date = now + timedelta(days=days_from_now)
 
-        # Build query
-        if include_expired:
-            query = f"contract_end_date<='{future_date.strftime('%Y-%m-%d')}'"
-        else:
-            query = (
-                f"contract_end_date>='{now.strftime('%Y-%m-%d')}' "
-                f"AND contract_end_date<='{future_date.strftime('%Y-%m-%d')}'"
-            )
-
-        if status_filter:
-            query += f" AND wfstate='{status_filter}'"
+        query = _build_expiring_query(
+            now.strftime(_DATE_FMT), future_date.strftime(_DATE_FMT),
+            include_expired, status_filter,
+        )
 
         results = await client.search_records(
-            "/contract", query,
-            [
-                "id", "contract_title1", "company_name", "contract_type",
-                "contract_end_date", "contract_amount", "wfstate",
-                "auto_renewal_term_in_months", "internal_contract_owner",
-            ],
-            limit=200,
+            "/contract", query, _EXPIRING_CONTRACT_FIELDS, limit=200,
         )
 
         # Categorize by urgency
@@ -485,7 +660,7 @@ async def handle_find_expiring_contracts(
             if not end_date_str:
                 continue
             try:
-                end_date = datetime.strptime(str(end_date_str)[:10], "%Y-%m-%d")
+                end_date = _parse_date(end_date_str)
                 days_remaining = (end_date - now).days
                 contract["days_remaining"] = days_remaining
 
@@ -538,7 +713,7 @@ async def handle_find_expiring_contracts(
 
         return _workflow_response(
             "find_expiring_contracts", data,
-            next_steps=next_steps, warnings=warnings,
+            next_steps=next_steps, warnings=warnings, hint_size="large",
         )
 
     except Exception as e:
@@ -571,8 +746,7 @@ async def handle_onboard_company_with_contact(
     try:
         # Step 1: Check if company exists
         existing = await client.search_records(
-            "/company", f"company_name='{company_name}'",
-            ["id", "company_name", "type_of_company", "status"],
+            "/company", f"company_name='{_q(company_name)}'", _COMPANY_FIELDS,
         )
 
         if existing:
@@ -593,16 +767,18 @@ async def handle_onboard_company_with_contact(
                 )
         else:
             # Create company
-            create_data = {k: v for k, v in company_data.items() if v is not None and v != ""}
+            create_data = strip_empty_values(company_data)
             company_result = await client.create_record("/company", create_data)
             data["company"] = company_result
             data["company_action"] = "created"
 
         # Step 2: Create contact if provided
         if contact_data:
-            contact_create = {k: v for k, v in contact_data.items() if v is not None and v != ""}
             # Link contact to company
-            contact_create["company_name"] = f":{company_name}"
+            contact_create = {
+                **strip_empty_values(contact_data),
+                "company_name": f":{company_name}",
+            }
             contact_result = await client.create_record("/contacts", contact_create)
             data["contact"] = contact_result
             data["contact_action"] = "created"
@@ -628,6 +804,8 @@ async def handle_onboard_company_with_contact(
             "onboard_company_with_contact", str(e),
             partial_data=data if data else None,
         )
+    finally:
+        _invalidate_entities("company", "contact")
 
 
 # ---------------------------------------------------------------------------
@@ -647,8 +825,6 @@ async def handle_attach_file_to_contract(
     The file_path must be an absolute path on the local macOS filesystem.
     The server reads the file directly from disk.
     """
-    import os
-
     contract_id = arguments.get("contract_id")
     file_path = arguments.get("file_path", "")
     file_name = arguments.get("file_name", "")
@@ -666,8 +842,7 @@ async def handle_attach_file_to_contract(
         )
 
     # Detect sandbox paths and reject them with a helpful message
-    _sandbox_prefixes = ("/mnt/", "/home/claude", "/tmp/sandbox", "/sandbox/")
-    if any(file_path.startswith(p) for p in _sandbox_prefixes):
+    if file_path.startswith(SANDBOX_PREFIXES):
         return _workflow_error(
             "attach_file_to_contract",
             f"'{file_path}' is a sandbox path, not a real filesystem path. "
@@ -685,21 +860,21 @@ async def handle_attach_file_to_contract(
             "Ask the user to verify the file location.",
         )
 
+    if not file_name:
+        file_name = os.path.basename(file_path)
+    if not attachment_title:
+        attachment_title = file_name
+
+    # Size comes from stat so an empty file is rejected without reading it
+    # or calling the API.
     try:
-        with open(file_path, "rb") as f:
-            file_data = f.read()
-    except Exception as e:
+        file_size = os.stat(file_path).st_size
+    except OSError as e:
         return _workflow_error(
             "attach_file_to_contract",
             f"Could not read file {file_path}: {e}",
         )
 
-    if not file_name:
-        file_name = os.path.basename(file_path)
-    if not attachment_title:
-        attachment_title = file_name
-
-    file_size = len(file_data)
     logger.info(
         f"attach_file_to_contract: contract_id={contract_id}, "
         f"file_name={file_name}, file_size={file_size} bytes, "
@@ -712,11 +887,23 @@ async def handle_attach_file_to_contract(
             "File is empty (0 bytes).",
         )
 
+    # The file is streamed to the upload in step 3 rather than read into
+    # memory; opening it up front means an unreadable file is reported before
+    # any records are created.
+    try:
+        with open(file_path, "rb"):
+            pass
+    except OSError as e:
+        return _workflow_error(
+            "attach_file_to_contract",
+            f"Could not read file {file_path}: {e}",
+        )
+
     try:
         # Step 1: Get contract title for linking
         logger.info(f"Step 1: Getting contract {contract_id} title...")
         contract = await client.get_record(
-            "/contract", contract_id, ["id", "contract_title1"]
+            "/contract", contract_id, _CONTRACT_TITLE_FIELDS
         )
         contract_title = contract.get("contract_title1", "")
         data["contract"] = contract
@@ -763,7 +950,8 @@ async def handle_attach_file_to_contract(
             f"Step 3: Uploading {file_size} bytes to attachment {attachment_id}..."
         )
         upload_result = await client.attach_file(
-            "/attachment", attachment_id, "attached_file", file_name, file_data
+            "/attachment", attachment_id, "attached_file", file_name,
+            file_path=file_path,
         )
         data["upload_result"] = upload_result
         logger.info(f"Step 3 done: upload_result={upload_result}")
@@ -794,6 +982,8 @@ async def handle_attach_file_to_contract(
             "attach_file_to_contract", str(e),
             partial_data=data if data else None,
         )
+    finally:
+        _invalidate_entities("attachment")
 
 
 # ---------------------------------------------------------------------------
@@ -821,16 +1011,14 @@ async def handle_download_contract_attachment(
     next_steps: List[str] = []
 
     # Validate save_dir if provided
-    if save_dir:
-        _sandbox_prefixes = ("/mnt/", "/home/claude", "/tmp/sandbox", "/sandbox/")
-        if any(save_dir.startswith(p) for p in _sandbox_prefixes):
-            return _workflow_error(
-                "download_contract_attachment",
-                f"'{save_dir}' is a sandbox path, not a real filesystem path. "
-                "The MCP server runs on the local machine and needs the actual macOS "
-                "path (e.g. '/Users/hector/Downloads'). "
-                "Please ask the user for the real directory on their Mac.",
-            )
+    if save_dir and save_dir.startswith(SANDBOX_PREFIXES):
+        return _workflow_error(
+            "download_contract_attachment",
+            f"'{save_dir}' is a sandbox path, not a real filesystem path. "
+            "The MCP server runs on the local machine and needs the actual macOS "
+            "path (e.g. '/Users/hector/Downloads'). "
+            "Please ask the user for the real directory on their Mac.",
+        )
 
     try:
         # If attachment_id given, skip search and download directly
@@ -857,8 +1045,7 @@ async def handle_download_contract_attachment(
             f"contract_id={contract_id}"
         )
         attach_results = await client.search_records(
-            "/attachment", f"contract_id='{contract_id}'",
-            ["id", "title", "status", "attached_file"],
+            "/attachment", f"contract_id='{_q(contract_id)}'", _ATTACHMENT_FIELDS,
         )
 
         # Step 2: Fallback - search by contract_title
@@ -868,15 +1055,15 @@ async def handle_download_contract_attachment(
             )
             try:
                 contract = await client.get_record(
-                    "/contract", contract_id, ["id", "contract_title1"]
+                    "/contract", contract_id, _CONTRACT_TITLE_FIELDS
                 )
                 contract_title = contract.get("contract_title1", "")
                 data["contract_title"] = contract_title
 
                 if contract_title:
                     attach_results = await client.search_records(
-                        "/attachment", f"contract_title~='{contract_title}'",
-                        ["id", "title", "status", "attached_file"],
+                        "/attachment", f"contract_title~='{_q(contract_title)}'",
+                        _ATTACHMENT_FIELDS,
                     )
             except Exception as e:
                 logger.warning(f"Could not fetch contract title: {e}")
@@ -934,7 +1121,9 @@ async def handle_download_contract_attachment(
 # Dispatch
 # ---------------------------------------------------------------------------
 
-WORKFLOW_HANDLERS = {
+WorkflowHandler = Callable[[Dict[str, Any], AgiloftClient], Awaitable[List[TextContent]]]
+
+WORKFLOW_HANDLERS: Dict[str, WorkflowHandler] = {
     "preflight_create_contract": handle_preflight_create_contract,
     "create_contract_with_company": handle_create_contract_with_company,
     "get_contract_summary": handle_get_contract_summary,
@@ -945,9 +1134,26 @@ WORKFLOW_HANDLERS = {
 }
 
 
+def build_workflow_handler_table(
+    workflow_dispatch: Dict[str, str],
+) -> Dict[str, WorkflowHandler]:
+    """Resolve a generate_workflow_tools() dispatch map into tool_name -> handler.
+
+    Built once at startup so each call is a single dict lookup. Raises
+    ValueError for any entry naming an unknown handler.
+    """
+    table = {}
+    for name, handler_name in workflow_dispatch.items():
+        handler = WORKFLOW_HANDLERS.get(handler_name)
+        if not handler:
+            raise ValueError(f"Unknown workflow handler: {handler_name}")
+        table[name] = handler
+    return table
+
+
 async def dispatch_workflow_call(
     name: str, arguments: Dict[str, Any], client: AgiloftClient,
-    workflow_dispatch: Dict[str, str],
+    handler_table: Dict[str, WorkflowHandler],
 ) -> List[TextContent]:
     """Dispatch a workflow tool call to the appropriate handler.
 
@@ -955,14 +1161,10 @@ async def dispatch_workflow_call(
         name: Tool name (e.g., "agiloft_preflight_create_contract")
         arguments: Tool arguments from MCP
         client: AgiloftClient instance
-        workflow_dispatch: Mapping of tool_name -> handler_name
+        handler_table: The table from build_workflow_handler_table()
     """
-    handler_name = workflow_dispatch.get(name)
-    if not handler_name:
-        raise ValueError(f"Unknown workflow tool: {name}")
-
-    handler = WORKFLOW_HANDLERS.get(handler_name)
+    handler = handler_table.get(name)
     if not handler:
-        raise ValueError(f"Unknown workflow handler: {handler_name}")
+        raise ValueError(f"Unknown workflow tool: {name}")
 
     return await handler(arguments, client)
@@ -314,7 +314,7 @@ _DOWNLOAD_CONTRACT_ATTACHMENT = Tool(
 )
 
 # Master list: (Tool, handler_name)
-_ALL_WORKFLOW_TOOLS = [
+_ALL_WORKFLOW_TOOLS: Tuple[Tuple[Tool, str], ...] = (
     (_PREFLIGHT_CREATE_CONTRACT, "preflight_create_contract"),
     (_CREATE_CONTRACT_WITH_COMPANY, "create_contract_with_company"),
     (_GET_CONTRACT_SUMMARY, "get_contract_summary"),
@@ -322,4 +322,4 @@ _ALL_WORKFLOW_TOOLS = [
     (_ONBOARD_COMPANY_WITH_CONTACT, "onboard_company_with_contact"),
     (_ATTACH_FILE_TO_CONTRACT, "attach_file_to_contract"),
     (_DOWNLOAD_CONTRACT_ATTACHMENT, "download_contract_attachment"),
-]
+)
@@ -7,28 +7,19 @@ before integrating with the MCP server.
 """
 
 import asyncio
-import json
 import logging
 from src.config import Config
 from src.agiloft_client import AgiloftClient
+from src.serialization import dumps
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def test_authentication():
+async def test_authentication(client):
     """Test basic authentication."""
     print("\n=== Testing Authentication ===")
     
-    config = Config()
-    
-    # Validate configuration
-    if not config.validate():
-        print("❌ Configuration validation failed. Please check your config.json or environment variables.")
-        return False
-        
-    client = AgiloftClient(config)
-    
     try:
         await client.ensure_authenticated()
         print("✅ Authentication successful")
@@ -37,16 +28,11 @@ async def test_authentication():
     except Exception as e:
         print(f"❌ Authentication failed: {e}")
         return False
-    finally:
-        await client.close()
 
-async def test_search():
+async def test_search(client):
     """Test contract search functionality."""
     print("\n=== Testing Contract Search ===")
     
-    config = Config()
-    client = AgiloftClient(config)
-    
     try:
         # Test basic search
         results = await client.search_contracts()
@@ -68,16 +54,11 @@ async def test_search():
     except Exception as e:
         print(f"❌ Search failed: {e}")
         return False
-    finally:
-        await client.close()
 
-async def test_get_contract():
+async def test_get_contract(client):
     """Test getting a specific contract."""
     print("\n=== Testing Get Contract ===")
     
-    config = Config()
-    client = AgiloftClient(config)
-    
     try:
         # First, get a contract ID from search
         results = await client.search_contracts(fields=["id"], query="record_type='Contract'")
@@ -97,16 +78,14 @@ async def test_get_contract():
             contract_id, 
             fields=["id", "contract_title1", "company_name", "contract_amount"]
         )
-        print(f"✅ Filtered contract data: {json.dumps(filtered_contract, indent=2, default=str)}")
+        print(f"✅ Filtered contract data: {dumps(filtered_contract, compact=False)}")
         
         return True
     except Exception as e:
         print(f"❌ Get contract failed: {e}")
         return False
-    finally:
-        await client.close()
 
-async def test_create_update_delete():
+async def test_create_update_delete(client):
     """Test contract creation, update, and deletion."""
     print("\n=== Testing Create/Update/Delete ===")
     print("⚠️  This test will create and delete a test contract")
@@ -116,9 +95,6 @@ async def test_create_update_delete():
         print("Skipping create/update/delete test")
         return True
         
-    config = Config()
-    client = AgiloftClient(config)
-    
     try:
         # First, get some real data from existing contracts to use in our test
         print("Fetching existing contract data for realistic test values...")
@@ -173,11 +149,11 @@ async def test_create_update_delete():
         print(f"  Note: Adding ':' prefix to company_name and internal_contract_owner per requirements")
         print(f"  Note: Based on example_create_contract.json, no fields are mandatory")
         print("\nPOST Request Body:")
-        print(json.dumps(test_contract, indent=2))
+        print(dumps(test_contract, compact=False))
         
         print("\nCreating test contract...")
         create_result = await client.create_contract(test_contract)
-        print(f"✅ Contract created: {json.dumps(create_result, indent=2, default=str)}")
+        print(f"✅ Contract created: {dumps(create_result, compact=False)}")
         
         # Extract contract ID from response
         contract_id = None
@@ -208,21 +184,19 @@ async def test_create_update_delete():
         }
         
         update_result = await client.update_contract(contract_id, update_data)
-        print(f"✅ Contract updated: {json.dumps(update_result, indent=2, default=str)}")
+        print(f"✅ Contract updated: {dumps(update_result, compact=False)}")
         
         # Delete the contract
         print("Deleting test contract...")
         delete_rule = "UNLINK_WHERE_POSSIBLE_OTHERWISE_DELETE"
         print(f"Using delete rule: {delete_rule}")
         delete_result = await client.delete_contract(contract_id, delete_rule)
-        print(f"✅ Contract deleted: {json.dumps(delete_result, indent=2, default=str)}")
+        print(f"✅ Contract deleted: {dumps(delete_result, compact=False)}")
         
         return True
     except Exception as e:
         print(f"❌ Create/Update/Delete failed: {e}")
         return False
-    finally:
-        await client.close()
 
 async def main():
     """Run all tests."""
@@ -236,15 +210,28 @@ async def main():
         ("Create/Update/Delete", test_create_update_delete)
     ]
     
+    config = Config()
+    
+    # Validate configuration
+    if not config.validate():
+        print("❌ Configuration validation failed. Please check your config.json or environment variables.")
+        return
+    
+    # One client for every test, so the suite authenticates and opens the
+    # HTTP session once rather than per test
+    client = AgiloftClient(config)
     results = []
     
-    for test_name, test_func in tests:
-        try:
-            result = await test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} test crashed: {e}")
-            results.append((test_name, False))
+    try:
+        for test_name, test_func in tests:
+            try:
+                result = await test_func(client)
+                results.append((test_name, result))
+            except Exception as e:
+                print(f"❌ {test_name} test crashed: {e}")
+                results.append((test_name, False))
+    finally:
+        await client.close()
     
     # Summary
     print("\n" + "=" * 40)
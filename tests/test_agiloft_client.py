@@ -14,46 +14,78 @@ from src.config import Config
 from src.exceptions import AgiloftAuthError, AgiloftAPIError
 
 
-@pytest.fixture
+_LEGACY_CONFIG = {
+    'agiloft.base_url': 'https://test.agiloft.com/api',
+    'agiloft.username': 'testuser',
+    'agiloft.password': 'testpass',
+    'agiloft.kb': 'TestKB',
+    'agiloft.language': 'en',
+    'agiloft.auth_method': 'legacy',
+    'agiloft.oauth2.client_id': '',
+    'agiloft.oauth2.client_secret': '',
+    'agiloft.oauth2.token_endpoint': '',
+    'agiloft.oauth2.authorization_endpoint': '',
+    'agiloft.oauth2.redirect_uri': 'http://localhost:8080/callback',
+    'agiloft.oauth2.scope': '',
+}
+
+
+_OAUTH2_CONFIG = {
+    'agiloft.base_url': 'https://test.agiloft.com/api',
+    'agiloft.username': '',
+    'agiloft.password': '',
+    'agiloft.kb': 'TestKB',
+    'agiloft.language': 'en',
+    'agiloft.auth_method': 'oauth2_client_credentials',
+    'agiloft.oauth2.client_id': 'test-client-id',
+    'agiloft.oauth2.client_secret': 'test-client-secret',
+    'agiloft.oauth2.token_endpoint': 'https://test.agiloft.com/oauth/token',
+    'agiloft.oauth2.authorization_endpoint': '',
+    'agiloft.oauth2.redirect_uri': 'http://localhost:8080/callback',
+    'agiloft.oauth2.scope': '',
+}
+
+
+class _StubConfig:
+    """Config stand-in that serves get() from a fixed dict."""
+
+    def __init__(self, values):
+        self._values = values
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+
+def _returns(value):
+    """Coroutine function returning value, for mock response .json()/.text()."""
+    async def method(*args, **kwargs):
+        return value
+    return method
+
+
+class _AsyncCM:
+    """Async context manager yielding a mock response, like session.post()."""
+
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+@pytest.fixture(scope="module")
 def mock_config():
     """Create a mock configuration for legacy auth."""
-    config = MagicMock(spec=Config)
-    config.get.side_effect = lambda key, default=None: {
-        'agiloft.base_url': 'https://test.agiloft.com/api',
-        'agiloft.username': 'testuser',
-        'agiloft.password': 'testpass',
-        'agiloft.kb': 'TestKB',
-        'agiloft.language': 'en',
-        'agiloft.auth_method': 'legacy',
-        'agiloft.oauth2.client_id': '',
-        'agiloft.oauth2.client_secret': '',
-        'agiloft.oauth2.token_endpoint': '',
-        'agiloft.oauth2.authorization_endpoint': '',
-        'agiloft.oauth2.redirect_uri': 'http://localhost:8080/callback',
-        'agiloft.oauth2.scope': '',
-    }.get(key, default)
-    return config
+    return _StubConfig(_LEGACY_CONFIG)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_oauth2_config():
     """Create a mock configuration for OAuth2 client credentials."""
-    config = MagicMock(spec=Config)
-    config.get.side_effect = lambda key, default=None: {
-        'agiloft.base_url': 'https://test.agiloft.com/api',
-        'agiloft.username': '',
-        'agiloft.password': '',
-        'agiloft.kb': 'TestKB',
-        'agiloft.language': 'en',
-        'agiloft.auth_method': 'oauth2_client_credentials',
-        'agiloft.oauth2.client_id': 'test-client-id',
-        'agiloft.oauth2.client_secret': 'test-client-secret',
-        'agiloft.oauth2.token_endpoint': 'https://test.agiloft.com/oauth/token',
-        'agiloft.oauth2.authorization_endpoint': '',
-        'agiloft.oauth2.redirect_uri': 'http://localhost:8080/callback',
-        'agiloft.oauth2.scope': '',
-    }.get(key, default)
-    return config
+    return _StubConfig(_OAUTH2_CONFIG)
 
 
 @pytest.fixture
@@ -71,8 +103,7 @@ def oauth2_client(mock_oauth2_config):
 class TestAgiloftClient:
     """Test cases for AgiloftClient class."""
 
-    @pytest.mark.asyncio
-    async def test_init_legacy(self, mock_config):
+    def test_init_legacy(self, mock_config):
         """Test client initialization with legacy auth."""
         client = AgiloftClient(mock_config)
 
@@ -85,8 +116,7 @@ class TestAgiloftClient:
         assert client.session is None
         assert client.access_token is None
 
-    @pytest.mark.asyncio
-    async def test_init_oauth2(self, mock_oauth2_config):
+    def test_init_oauth2(self, mock_oauth2_config):
         """Test client initialization with OAuth2 auth."""
         client = AgiloftClient(mock_oauth2_config)
 
@@ -96,20 +126,38 @@ class TestAgiloftClient:
         assert client.oauth2_token_endpoint == 'https://test.agiloft.com/oauth/token'
 
     @pytest.mark.asyncio
-    async def test_ensure_session(self, client):
+    @patch("src.agiloft_client.aiohttp.TCPConnector")
+    @patch("src.agiloft_client.aiohttp.ClientSession")
+    async def test_ensure_session(self, mock_session_cls, mock_connector_cls, client):
         """Test session creation."""
         await client.ensure_session()
 
-        assert client.session is not None
-        assert isinstance(client.session, aiohttp.ClientSession)
+        assert client.session is mock_session_cls.return_value
+        mock_session_cls.assert_called_once()
 
-        await client.close()
+    @pytest.mark.asyncio
+    @patch("src.agiloft_client.aiohttp.TCPConnector")
+    @patch("src.agiloft_client.aiohttp.ClientSession")
+    async def test_session_keeps_connections_alive(self, mock_session_cls, mock_connector_cls, client):
+        """Idle connections should outlive aiohttp's 15s default."""
+        await client.ensure_session()
+
+        mock_connector_cls.assert_called_once_with(keepalive_timeout=60, ttl_dns_cache=300)
+        assert mock_session_cls.call_args.kwargs["connector"] is mock_connector_cls.return_value
 
     @pytest.mark.asyncio
-    async def test_context_manager(self, mock_config):
+    @patch("src.agiloft_client.aiohttp.TCPConnector")
+    @patch("src.agiloft_client.aiohttp.ClientSession")
+    async def test_context_manager(self, mock_session_cls, mock_connector_cls, mock_config):
         """Test async context manager."""
+        session = mock_session_cls.return_value
+        session.closed = False
+        session.close = AsyncMock()
+
         async with AgiloftClient(mock_config) as client:
-            assert client.session is not None
+            assert client.session is session
+
+        session.close.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_legacy_authentication_success(self, client):
@@ -125,11 +173,9 @@ class TestAgiloftClient:
 
         mock_resp = AsyncMock()
         mock_resp.status = 200
-        mock_resp.json = AsyncMock(return_value=mock_response_data)
+        mock_resp.json = _returns(mock_response_data)
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -149,11 +195,9 @@ class TestAgiloftClient:
         """Test legacy authentication failure with HTTP error."""
         mock_resp = AsyncMock()
         mock_resp.status = 401
-        mock_resp.text = AsyncMock(return_value='Unauthorized')
+        mock_resp.text = _returns('Unauthorized')
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -173,11 +217,9 @@ class TestAgiloftClient:
 
         mock_resp = AsyncMock()
         mock_resp.status = 200
-        mock_resp.json = AsyncMock(return_value=mock_response_data)
+        mock_resp.json = _returns(mock_response_data)
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -234,15 +276,13 @@ class TestOAuth2ClientCredentials:
         mock_resp = AsyncMock()
         mock_resp.status = 200
         mock_resp.headers = {'Content-Type': 'application/json'}
-        mock_resp.json = AsyncMock(return_value={
+        mock_resp.json = _returns({
             'access_token': 'oauth2_token',
             'expires_in': 900,
             'refresh_token': 'oauth2_refresh'
         })
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -263,14 +303,12 @@ class TestOAuth2ClientCredentials:
         mock_resp = AsyncMock()
         mock_resp.status = 200
         mock_resp.headers = {'Content-Type': 'application/json'}
-        mock_resp.json = AsyncMock(return_value={
+        mock_resp.json = _returns({
             'access_token': 'token',
             'expires_in': 900
         })
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -294,11 +332,9 @@ class TestOAuth2ClientCredentials:
         """Test OAuth2 authentication failure with HTTP error."""
         mock_resp = AsyncMock()
         mock_resp.status = 400
-        mock_resp.text = AsyncMock(return_value='Bad Request')
+        mock_resp.text = _returns('Bad Request')
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -315,9 +351,7 @@ class TestOAuth2ClientCredentials:
         mock_resp.status = 200
         mock_resp.headers = {'Content-Type': 'text/html'}
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -333,11 +367,9 @@ class TestOAuth2ClientCredentials:
         mock_resp = AsyncMock()
         mock_resp.status = 200
         mock_resp.headers = {'Content-Type': 'application/json'}
-        mock_resp.json = AsyncMock(return_value={'expires_in': 900})
+        mock_resp.json = _returns({'expires_in': 900})
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -383,15 +415,13 @@ class TestTokenRefresh:
         mock_resp = AsyncMock()
         mock_resp.status = 200
         mock_resp.headers = {'Content-Type': 'application/json'}
-        mock_resp.text = AsyncMock(return_value=json.dumps({
+        mock_resp.text = _returns(json.dumps({
             'access_token': 'new_token',
             'expires_in': 900,
             'refresh_token': 'new_refresh'
         }))
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -419,15 +449,13 @@ class TestTokenRefresh:
         mock_resp = AsyncMock()
         mock_resp.status = 200
         mock_resp.headers = {'Content-Type': 'application/json'}
-        mock_resp.text = AsyncMock(return_value=json.dumps({
+        mock_resp.text = _returns(json.dumps({
             'access_token': 'new_token',
             'expires_in': 900,
             'refresh_token': 'rotated_refresh'
         }))
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.post.return_value = mock_cm
@@ -463,6 +491,32 @@ class TestTokenRefresh:
             mock_auth.assert_called_once()
             assert oauth2_client.refresh_token is None
 
+    @pytest.mark.asyncio
+    async def test_ensure_authenticated_skips_lock_for_valid_token(self, oauth2_client):
+        """A fresh token should return without touching the auth lock."""
+        oauth2_client.access_token = 'valid_token'
+        oauth2_client.token_expires_at = datetime.now() + timedelta(minutes=10)
+        oauth2_client._auth_lock = MagicMock()
+
+        with patch.object(oauth2_client, '_authenticate') as mock_auth:
+            await oauth2_client.ensure_authenticated()
+
+        mock_auth.assert_not_called()
+        oauth2_client._auth_lock.__aenter__.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ensure_authenticated_authenticates_once(self, oauth2_client):
+        """Callers that queue on the lock should see the new token."""
+        async def fake_auth():
+            await asyncio.sleep(0)
+            oauth2_client.access_token = 'new_token'
+            oauth2_client.token_expires_at = datetime.now() + timedelta(minutes=15)
+
+        with patch.object(oauth2_client, '_authenticate', side_effect=fake_auth) as mock_auth:
+            await asyncio.gather(*(oauth2_client.ensure_authenticated() for _ in range(3)))
+
+        mock_auth.assert_called_once()
+
 
 class TestSanitizeError:
     """Test error message sanitization."""
@@ -483,14 +537,12 @@ class TestSanitizeError:
 class TestAgiloftClientRequests:
     """Test API request methods."""
 
-    @pytest.mark.asyncio
-    async def test_get_auth_headers_no_token(self, client):
+    def test_get_auth_headers_no_token(self, client):
         """Test auth headers when no token is available."""
         with pytest.raises(AgiloftAuthError, match="No access token available"):
             client._get_auth_headers()
 
-    @pytest.mark.asyncio
-    async def test_get_auth_headers_with_token(self, client):
+    def test_get_auth_headers_with_token(self, client):
         """Test auth headers with valid token."""
         client.access_token = 'test_token'
 
@@ -508,11 +560,9 @@ class TestAgiloftClientRequests:
 
         mock_resp = AsyncMock()
         mock_resp.status = 200
-        mock_resp.text = AsyncMock(return_value='{"result": "success"}')
+        mock_resp.text = _returns('{"result": "success"}')
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.request.return_value = mock_cm
@@ -533,20 +583,16 @@ class TestAgiloftClientRequests:
         # First response: 401
         mock_resp_401 = AsyncMock()
         mock_resp_401.status = 401
-        mock_resp_401.text = AsyncMock(return_value='Unauthorized')
+        mock_resp_401.text = _returns('Unauthorized')
 
-        mock_cm_401 = MagicMock()
-        mock_cm_401.__aenter__ = AsyncMock(return_value=mock_resp_401)
-        mock_cm_401.__aexit__ = AsyncMock(return_value=None)
+        mock_cm_401 = _AsyncCM(mock_resp_401)
 
         # Second response: 200 (after re-auth)
         mock_resp_200 = AsyncMock()
         mock_resp_200.status = 200
-        mock_resp_200.text = AsyncMock(return_value='{"result": "success"}')
+        mock_resp_200.text = _returns('{"result": "success"}')
 
-        mock_cm_200 = MagicMock()
-        mock_cm_200.__aenter__ = AsyncMock(return_value=mock_resp_200)
-        mock_cm_200.__aexit__ = AsyncMock(return_value=None)
+        mock_cm_200 = _AsyncCM(mock_resp_200)
 
         mock_session = MagicMock()
         mock_session.request.side_effect = [mock_cm_401, mock_cm_200]
@@ -570,20 +616,16 @@ class TestAgiloftClientRequests:
         # First response: 401
         mock_resp_401 = AsyncMock()
         mock_resp_401.status = 401
-        mock_resp_401.text = AsyncMock(return_value='Unauthorized')
+        mock_resp_401.text = _returns('Unauthorized')
 
-        mock_cm_401 = MagicMock()
-        mock_cm_401.__aenter__ = AsyncMock(return_value=mock_resp_401)
-        mock_cm_401.__aexit__ = AsyncMock(return_value=None)
+        mock_cm_401 = _AsyncCM(mock_resp_401)
 
         # Second response: 200
         mock_resp_200 = AsyncMock()
         mock_resp_200.status = 200
-        mock_resp_200.text = AsyncMock(return_value='{"result": "success"}')
+        mock_resp_200.text = _returns('{"result": "success"}')
 
-        mock_cm_200 = MagicMock()
-        mock_cm_200.__aenter__ = AsyncMock(return_value=mock_resp_200)
-        mock_cm_200.__aexit__ = AsyncMock(return_value=None)
+        mock_cm_200 = _AsyncCM(mock_resp_200)
 
         mock_session = MagicMock()
         mock_session.request.side_effect = [mock_cm_401, mock_cm_200]
@@ -614,18 +656,6 @@ class TestAgiloftClientRequests:
             assert len(results) == 2
             assert results[0]['contract_title1'] == 'Test Contract 1'
 
-    @pytest.mark.asyncio
-    async def test_search_contracts_failure(self, client):
-        """Test failed contract search."""
-        mock_response_data = {
-            'success': False,
-            'message': 'Search failed'
-        }
-
-        with patch.object(client, '_make_request', return_value=mock_response_data):
-            with pytest.raises(AgiloftAPIError, match="Search failed: Search failed"):
-                await client.search_contracts('test query')
-
     @pytest.mark.asyncio
     async def test_get_contract_success(self, client):
         """Test successful get contract."""
@@ -663,83 +693,120 @@ class TestAgiloftClientRequests:
             assert 'extra_field' not in result
 
     @pytest.mark.asyncio
-    async def test_get_contract_not_found(self, client):
-        """Test get contract when not found."""
-        mock_response_data = {}
-
-        with patch.object(client, '_make_request', return_value=mock_response_data):
-            with pytest.raises(AgiloftAPIError, match="Record 999 not found in response"):
-                await client.get_contract(999)
+    async def test_attach_file_streams_file_path(self, client, tmp_path):
+        """A path should be opened per attempt and closed once the upload returns."""
+        test_file = tmp_path / "contract.pdf"
+        test_file.write_bytes(b"%PDF-1.4")
+        opened = []
+
+        def tracking_open(*args, **kwargs):
+            file_obj = open(*args, **kwargs)
+            opened.append(file_obj)
+            return file_obj
+
+        async def make_request(method, endpoint, data_factory, **kwargs):
+            data_factory()
+            return {'success': True}
+
+        with patch.object(client, '_make_request', side_effect=make_request) as mock_request, \
+             patch('src.agiloft_client.open', side_effect=tracking_open, create=True):
+            await client.attach_file(
+                '/attachment', 5, 'attached_file', 'contract.pdf', file_path=str(test_file)
+            )
 
-    @pytest.mark.asyncio
-    async def test_create_contract_success(self, client):
-        """Test successful contract creation."""
-        mock_response_data = {
-            'success': True,
-            'contract': {'id': 123, 'contract_title1': 'New Contract'}
+        assert mock_request.call_args.kwargs['params'] == {
+            'field': 'attached_file', 'fileName': 'contract.pdf'
         }
-
-        contract_data = {'contract_title1': 'New Contract'}
-
-        with patch.object(client, '_make_request', return_value=mock_response_data):
-            result = await client.create_contract(contract_data)
-
-            assert result == mock_response_data
+        assert len(opened) == 1
+        assert opened[0].closed
 
     @pytest.mark.asyncio
-    async def test_create_contract_failure(self, client):
-        """Test failed contract creation."""
-        mock_response_data = {
-            'success': False,
-            'message': 'Validation failed',
-            'errors': [{'message': 'Title is required'}]
-        }
-
-        contract_data = {}
-
-        with patch.object(client, '_make_request', return_value=mock_response_data):
-            with pytest.raises(AgiloftAPIError, match="Create failed: Validation failed - Title is required"):
-                await client.create_contract(contract_data)
+    async def test_attach_file_requires_one_source(self, client):
+        """Exactly one of file_data and file_path must be given."""
+        with pytest.raises(ValueError):
+            await client.attach_file('/attachment', 5, 'attached_file', 'a.pdf')
+        with pytest.raises(ValueError):
+            await client.attach_file(
+                '/attachment', 5, 'attached_file', 'a.pdf', b"x", file_path="/tmp/a.pdf"
+            )
 
     @pytest.mark.asyncio
-    async def test_update_contract_success(self, client):
-        """Test successful contract update."""
-        mock_response_data = {
-            'success': True,
-            'contract': {'id': 123, 'contract_title1': 'Updated Contract'}
-        }
-
-        update_data = {'contract_title1': 'Updated Contract'}
-
-        with patch.object(client, '_make_request', return_value=mock_response_data):
-            result = await client.update_contract(123, update_data)
+    async def test_attach_file_path_resent_after_401(self, client, tmp_path):
+        """A streamed file upload should be rebuilt, not reused, on the 401 retry."""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+
+        test_file = tmp_path / "contract.pdf"
+        test_file.write_bytes(b"%PDF-1.4 body")
+        received = []
+
+        async def attach(request):
+            form = await request.post()
+            received.append(form['uploadFile'].file.read())
+            if len(received) == 1:
+                return web.Response(status=401, text='Unauthorized')
+            return web.json_response({'success': True})
+
+        app = web.Application()
+        app.router.add_post('/attachment/attach/5', attach)
+        server = TestServer(app)
+        await server.start_server()
+        client.base_url = str(server.make_url('')).rstrip('/')
+        client.access_token = 'old_token'
+        client.refresh_token = None
+
+        async def reauthenticate():
+            client.access_token = 'new_token'
+
+        try:
+            with patch.object(client, 'ensure_authenticated'), \
+                 patch.object(client, '_authenticate', side_effect=reauthenticate):
+                result = await client.attach_file(
+                    '/attachment', 5, 'attached_file', 'contract.pdf', file_path=str(test_file)
+                )
+        finally:
+            await client.close()
+            await server.close()
 
-            assert result == mock_response_data
+        assert result == {'success': True}
+        assert received == [b"%PDF-1.4 body", b"%PDF-1.4 body"]
 
     @pytest.mark.asyncio
-    async def test_delete_contract_success(self, client):
-        """Test successful contract deletion."""
-        mock_response_data = {
-            'success': True,
-            'message': 'Contract deleted'
-        }
-
-        with patch.object(client, '_make_request', return_value=mock_response_data):
-            result = await client.delete_contract(123)
-
-            assert result == mock_response_data
+    @pytest.mark.parametrize("method,args,response", [
+        ("create_contract", ({'contract_title1': 'New Contract'},),
+         {'success': True, 'contract': {'id': 123, 'contract_title1': 'New Contract'}}),
+        ("update_contract", (123, {'contract_title1': 'Updated Contract'}),
+         {'success': True, 'contract': {'id': 123, 'contract_title1': 'Updated Contract'}}),
+        ("delete_contract", (123,),
+         {'success': True, 'message': 'Contract deleted'}),
+    ])
+    async def test_write_contract_success(self, client, method, args, response):
+        """Successful writes return the API response as-is."""
+        with patch.object(client, '_make_request', return_value=response):
+            result = await getattr(client, method)(*args)
+
+            assert result == response
 
     @pytest.mark.asyncio
-    async def test_delete_contract_failure(self, client):
-        """Test failed contract deletion."""
-        mock_response_data = {
-            'success': False,
-            'message': 'Cannot delete - has dependencies'
-        }
-
-        with patch.object(client, '_make_request', return_value=mock_response_data):
-            with pytest.raises(AgiloftAPIError, match="Delete failed: Cannot delete - has dependencies"):
-                await client.delete_contract(123)
+    @pytest.mark.parametrize("method,args,response,error", [
+        ("search_contracts", ('test query',),
+         {'success': False, 'message': 'Search failed'},
+         "Search failed: Search failed"),
+        ("get_contract", (999,), {},
+         "Record 999 not found in response"),
+        ("create_contract", ({},),
+         {'success': False, 'message': 'Validation failed',
+          'errors': [{'message': 'Title is required'}]},
+         "Create failed: Validation failed - Title is required"),
+        ("delete_contract", (123,),
+         {'success': False, 'message': 'Cannot delete - has dependencies'},
+         "Delete failed: Cannot delete - has dependencies"),
+    ])
+    async def test_contract_call_failure(self, client, method, args, response, error):
+        """Failed API responses raise AgiloftAPIError with the API's message."""
+        with patch.object(client, '_make_request', return_value=response):
+            with pytest.raises(AgiloftAPIError, match=error):
+                await getattr(client, method)(*args)
 
     @pytest.mark.asyncio
     async def test_http_client_error(self, client):
@@ -886,15 +953,13 @@ class TestMakeBinaryRequest:
 
         mock_resp = AsyncMock()
         mock_resp.status = 200
-        mock_resp.read = AsyncMock(return_value=b"binary file data")
+        mock_resp.read = _returns(b"binary file data")
         mock_resp.headers = {
             "Content-Type": "application/pdf",
             "Content-Disposition": 'attachment; filename="test.pdf"',
         }
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.request.return_value = mock_cm
@@ -918,24 +983,20 @@ class TestMakeBinaryRequest:
         mock_resp_401 = AsyncMock()
         mock_resp_401.status = 401
         mock_resp_401.headers = {"Content-Type": "text/html"}
-        mock_resp_401.text = AsyncMock(return_value="Unauthorized")
+        mock_resp_401.text = _returns("Unauthorized")
 
-        mock_cm_401 = MagicMock()
-        mock_cm_401.__aenter__ = AsyncMock(return_value=mock_resp_401)
-        mock_cm_401.__aexit__ = AsyncMock(return_value=None)
+        mock_cm_401 = _AsyncCM(mock_resp_401)
 
         # Second: 200
         mock_resp_200 = AsyncMock()
         mock_resp_200.status = 200
-        mock_resp_200.read = AsyncMock(return_value=b"file data")
+        mock_resp_200.read = _returns(b"file data")
         mock_resp_200.headers = {
             "Content-Type": "application/pdf",
             "Content-Disposition": 'attachment; filename="doc.pdf"',
         }
 
-        mock_cm_200 = MagicMock()
-        mock_cm_200.__aenter__ = AsyncMock(return_value=mock_resp_200)
-        mock_cm_200.__aexit__ = AsyncMock(return_value=None)
+        mock_cm_200 = _AsyncCM(mock_resp_200)
 
         mock_session = MagicMock()
         mock_session.request.side_effect = [mock_cm_401, mock_cm_200]
@@ -958,11 +1019,9 @@ class TestMakeBinaryRequest:
         mock_resp = AsyncMock()
         mock_resp.status = 200
         mock_resp.headers = {"Content-Type": "application/json"}
-        mock_resp.text = AsyncMock(return_value='{"success": false, "message": "No file found"}')
+        mock_resp.text = _returns('{"success": false, "message": "No file found"}')
 
-        mock_cm = MagicMock()
-        mock_cm.__aenter__ = AsyncMock(return_value=mock_resp)
-        mock_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_cm = _AsyncCM(mock_resp)
 
         mock_session = MagicMock()
         mock_session.request.return_value = mock_cm
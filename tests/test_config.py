@@ -4,13 +4,27 @@ Unit tests for config.py
 
 import json
 import os
-import tempfile
 import pytest
 from pathlib import Path
 from src.config import Config, AUTH_LEGACY, AUTH_OAUTH2_CLIENT_CREDENTIALS, VALID_AUTH_METHODS
 from src.exceptions import AgiloftConfigError
 
 
+@pytest.fixture
+def write_config(tmp_path):
+    """Write a config file under tmp_path and return its path.
+
+    Takes a dict (written as JSON) or raw file contents.
+    """
+    def write(contents):
+        path = tmp_path / "config.json"
+        if not isinstance(contents, str):
+            contents = json.dumps(contents)
+        path.write_text(contents)
+        return str(path)
+    return write
+
+
 class TestConfig:
     """Test cases for Config class."""
 
@@ -29,7 +43,7 @@ class TestConfig:
         assert config.get('server.port') == 8000
         assert config.get('server.log_level') == "INFO"
 
-    def test_config_file_loading(self):
+    def test_config_file_loading(self, write_config):
         """Test loading configuration from JSON file."""
         test_config = {
             "agiloft": {
@@ -42,30 +56,20 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            assert config.get('agiloft.base_url') == "https://test.example.com"
-            assert config.get('agiloft.username') == "testuser"
-            assert config.get('server.port') == 9000
-            assert config.get('agiloft.kb') == ""
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        assert config.get('agiloft.base_url') == "https://test.example.com"
+        assert config.get('agiloft.username') == "testuser"
+        assert config.get('server.port') == 9000
+        assert config.get('agiloft.kb') == ""
 
-    def test_invalid_json_file(self):
+    def test_invalid_json_file(self, write_config):
         """Test handling of invalid JSON configuration file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write("{ invalid json }")
-            config_path = f.name
+        config_path = write_config("{ invalid json }")
 
-        try:
-            with pytest.raises(AgiloftConfigError, match="Invalid configuration file"):
-                Config(config_path)
-        finally:
-            os.unlink(config_path)
+        with pytest.raises(AgiloftConfigError, match="Invalid configuration file"):
+            Config(config_path)
 
     def test_environment_variables(self, monkeypatch):
         """Test environment variable override."""
@@ -123,7 +127,16 @@ class TestConfig:
         assert isinstance(config.get('server.port'), int)
         assert config.get('server.max_retries') == 5
 
-    def test_validation_legacy_success(self):
+    def test_example_config_accepts_fractional_cache_ttl(self, monkeypatch):
+        """MCP_CACHE_TTL should override the example config's float cache_ttl."""
+        monkeypatch.setenv("MCP_CACHE_TTL", "0.5")
+        example = Path(__file__).resolve().parent.parent / "example_config.json"
+
+        config = Config(str(example))
+
+        assert config.get('server.cache_ttl') == 0.5
+
+    def test_validation_legacy_success(self, write_config):
         """Test successful validation for legacy auth."""
         test_config = {
             "agiloft": {
@@ -134,22 +147,17 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            assert config.validate() is True
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        assert config.validate() is True
 
     def test_validation_legacy_failure(self):
         """Test validation failure for legacy auth (missing password)."""
         config = Config("nonexistent.json")
         assert config.validate() is False
 
-    def test_validation_oauth2_client_credentials_success(self):
+    def test_validation_oauth2_client_credentials_success(self, write_config):
         """Test successful validation for OAuth2 client_credentials."""
         test_config = {
             "agiloft": {
@@ -164,17 +172,12 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            assert config.validate() is True
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        assert config.validate() is True
 
-    def test_validation_oauth2_missing_client_id(self):
+    def test_validation_oauth2_missing_client_id(self, write_config):
         """Test validation failure for OAuth2 with missing client_id."""
         test_config = {
             "agiloft": {
@@ -188,17 +191,12 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            assert config.validate() is False
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        assert config.validate() is False
 
-    def test_validation_invalid_auth_method(self):
+    def test_validation_invalid_auth_method(self, write_config):
         """Test validation failure for unknown auth method."""
         test_config = {
             "agiloft": {
@@ -208,17 +206,12 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            assert config.validate() is False
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        assert config.validate() is False
 
-    def test_validation_enforces_https_base_url(self):
+    def test_validation_enforces_https_base_url(self, write_config):
         """Test that base_url must use HTTPS."""
         test_config = {
             "agiloft": {
@@ -229,17 +222,12 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            assert config.validate() is False
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        assert config.validate() is False
 
-    def test_validation_enforces_https_token_endpoint(self):
+    def test_validation_enforces_https_token_endpoint(self, write_config):
         """Test that OAuth2 token_endpoint must use HTTPS."""
         test_config = {
             "agiloft": {
@@ -254,15 +242,10 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            assert config.validate() is False
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        assert config.validate() is False
 
     def test_to_dict(self):
         """Test converting configuration to dictionary."""
@@ -274,23 +257,22 @@ class TestConfig:
         assert 'server' in config_dict
         assert 'oauth2' in config_dict['agiloft']
 
-    def test_create_example_config(self):
+    def test_create_example_config(self, tmp_path):
         """Test creating example configuration file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            example_path = os.path.join(temp_dir, "example.json")
-            config = Config("nonexistent.json")
+        example_path = str(tmp_path / "example.json")
+        config = Config("nonexistent.json")
 
-            config.create_example_config(example_path)
+        config.create_example_config(example_path)
 
-            assert os.path.exists(example_path)
+        assert os.path.exists(example_path)
 
-            with open(example_path, 'r') as f:
-                example_config = json.load(f)
-                assert '_comments' in example_config
-                assert 'agiloft' in example_config
-                assert 'server' in example_config
+        with open(example_path, 'r') as f:
+            example_config = json.load(f)
+            assert '_comments' in example_config
+            assert 'agiloft' in example_config
+            assert 'server' in example_config
 
-    def test_string_representation_masks_password(self):
+    def test_string_representation_masks_password(self, write_config):
         """Test string representation with masked password."""
         test_config = {
             "agiloft": {
@@ -298,19 +280,14 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            config_str = str(config)
-            assert "secret123" not in config_str
-            assert "***masked***" in config_str
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        config_str = str(config)
+        assert "secret123" not in config_str
+        assert "***masked***" in config_str
 
-    def test_string_representation_masks_client_secret(self):
+    def test_string_representation_masks_client_secret(self, write_config):
         """Test string representation with masked OAuth2 client_secret."""
         test_config = {
             "agiloft": {
@@ -320,19 +297,14 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
+        config_path = write_config(test_config)
 
-        try:
-            config = Config(config_path)
-            config_str = str(config)
-            assert "super-secret-key" not in config_str
-            assert "***masked***" in config_str
-        finally:
-            os.unlink(config_path)
+        config = Config(config_path)
+        config_str = str(config)
+        assert "super-secret-key" not in config_str
+        assert "***masked***" in config_str
 
-    def test_oauth2_config_from_file(self):
+    def test_oauth2_config_from_file(self, write_config):
         """Test loading OAuth2 config from JSON file."""
         test_config = {
             "agiloft": {
@@ -348,17 +320,12 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            config_path = f.name
-
-        try:
-            config = Config(config_path)
-            assert config.get('agiloft.auth_method') == "oauth2_client_credentials"
-            assert config.get('agiloft.oauth2.client_id') == "file-client-id"
-            assert config.get('agiloft.oauth2.scope') == "permissions_for:100"
-        finally:
-            os.unlink(config_path)
+        config_path = write_config(test_config)
+
+        config = Config(config_path)
+        assert config.get('agiloft.auth_method') == "oauth2_client_credentials"
+        assert config.get('agiloft.oauth2.client_id') == "file-client-id"
+        assert config.get('agiloft.oauth2.scope') == "permissions_for:100"
 
     def test_valid_auth_methods_constant(self):
         """Test that VALID_AUTH_METHODS contains expected values."""
@@ -11,242 +11,79 @@ from src.entity_registry import (
 )
 
 
-class TestEntityRegistry:
-    """Test the entity registry configuration."""
-
-    def test_contract_registered(self):
-        """Contract entity should be in the registry."""
-        assert "contract" in ENTITY_REGISTRY
-
-    def test_contract_config_fields(self):
-        """Contract config should have all required fields."""
-        contract = ENTITY_REGISTRY["contract"]
-        assert contract.key == "contract"
-        assert contract.key_plural == "contracts"
-        assert contract.api_path == "/contract"
-        assert contract.display_name == "Contract"
-        assert contract.display_name_plural == "Contracts"
-        assert len(contract.key_fields) > 0
-        assert len(contract.default_search_fields) > 0
-        assert len(contract.required_fields) > 0
-        assert len(contract.text_search_fields) > 0
+# (key, key_plural, api_path, display_name, display_name_plural)
+ENTITY_CASES = [
+    ("contract", "contracts", "/contract", "Contract", "Contracts"),
+    ("company", "companies", "/company", "Company", "Companies"),
+    ("attachment", "attachments", "/attachment", "Attachment", "Attachments"),
+    ("contact", "contacts", "/contacts", "Contact", "Contacts"),
+    ("employee", "employees", "/contacts.employees", "Employee", "Employees"),
+    ("customer", "customers", "/contacts.customer", "Customer Contact", "Customer Contacts"),
+    ("contract_type", "contract_types", "/contract_type", "Contract Type", "Contract Types"),
+]
+ENTITY_KEYS = tuple(case[0] for case in ENTITY_CASES)
+REGISTERED_KEYS = tuple(sorted(ENTITY_REGISTRY))
 
-    def test_contract_key_fields_have_type_and_description(self):
-        """Each key field should have type and description."""
-        contract = ENTITY_REGISTRY["contract"]
-        for field_name, field_info in contract.key_fields.items():
-            assert "type" in field_info, f"Missing type for {field_name}"
-            assert "description" in field_info, f"Missing description for {field_name}"
 
-    def test_contract_required_fields_in_key_fields(self):
-        """Required fields should be documented in key_fields."""
-        contract = ENTITY_REGISTRY["contract"]
-        for required in contract.required_fields:
-            assert required in contract.key_fields, \
-                f"Required field '{required}' not in key_fields"
+@pytest.fixture(scope="module", params=REGISTERED_KEYS)
+def entity(request):
+    """Every registered EntityConfig, including ones not in ENTITY_CASES."""
+    return ENTITY_REGISTRY[request.param]
 
-    def test_contract_default_search_fields_include_id(self):
-        """Default search fields should include 'id'."""
-        contract = ENTITY_REGISTRY["contract"]
-        assert "id" in contract.default_search_fields
 
-    # --- Company entity tests ---
-
-    def test_company_registered(self):
-        """Company entity should be in the registry."""
-        assert "company" in ENTITY_REGISTRY
-
-    def test_company_config_fields(self):
-        """Company config should have all required fields."""
-        company = ENTITY_REGISTRY["company"]
-        assert company.key == "company"
-        assert company.key_plural == "companies"
-        assert company.api_path == "/company"
-        assert company.display_name == "Company"
-        assert company.display_name_plural == "Companies"
-        assert len(company.key_fields) > 0
-        assert len(company.default_search_fields) > 0
-        assert len(company.required_fields) > 0
-        assert len(company.text_search_fields) > 0
-
-    def test_company_key_fields_have_type_and_description(self):
-        """Each company key field should have type and description."""
-        company = ENTITY_REGISTRY["company"]
-        for field_name, field_info in company.key_fields.items():
-            assert "type" in field_info, f"Missing type for {field_name}"
-            assert "description" in field_info, f"Missing description for {field_name}"
-
-    def test_company_required_fields_in_key_fields(self):
-        """Company required fields should be documented in key_fields."""
-        company = ENTITY_REGISTRY["company"]
-        for required in company.required_fields:
-            assert required in company.key_fields, \
-                f"Required field '{required}' not in key_fields"
-
-    # --- Attachment entity tests ---
-
-    def test_attachment_registered(self):
-        """Attachment entity should be in the registry."""
-        assert "attachment" in ENTITY_REGISTRY
-
-    def test_attachment_config_fields(self):
-        """Attachment config should have all required fields."""
-        attachment = ENTITY_REGISTRY["attachment"]
-        assert attachment.key == "attachment"
-        assert attachment.key_plural == "attachments"
-        assert attachment.api_path == "/attachment"
-        assert attachment.display_name == "Attachment"
-        assert attachment.display_name_plural == "Attachments"
-        assert len(attachment.key_fields) > 0
-        assert len(attachment.default_search_fields) > 0
-        assert len(attachment.required_fields) > 0
-        assert len(attachment.text_search_fields) > 0
-
-    def test_attachment_key_fields_have_type_and_description(self):
-        """Each attachment key field should have type and description."""
-        attachment = ENTITY_REGISTRY["attachment"]
-        for field_name, field_info in attachment.key_fields.items():
-            assert "type" in field_info, f"Missing type for {field_name}"
-            assert "description" in field_info, f"Missing description for {field_name}"
-
-    def test_attachment_required_fields_in_key_fields(self):
-        """Attachment required fields should be documented in key_fields."""
-        attachment = ENTITY_REGISTRY["attachment"]
-        for required in attachment.required_fields:
-            assert required in attachment.key_fields, \
-                f"Required field '{required}' not in key_fields"
+@pytest.fixture(scope="module")
+def all_entity_keys():
+    """list_entities() result, built once for the module."""
+    return list_entities()
 
-    # --- Contact entity tests ---
 
-    def test_contact_registered(self):
-        """Contact entity should be in the registry."""
-        assert "contact" in ENTITY_REGISTRY
+@pytest.fixture(scope="module")
+def entity_key_set(all_entity_keys):
+    """all_entity_keys as a frozenset for membership checks."""
+    return frozenset(all_entity_keys)
 
-    def test_contact_config_fields(self):
-        """Contact config should have all required fields."""
-        contact = ENTITY_REGISTRY["contact"]
-        assert contact.key == "contact"
-        assert contact.key_plural == "contacts"
-        assert contact.api_path == "/contacts"
-        assert contact.display_name == "Contact"
-        assert contact.display_name_plural == "Contacts"
-        assert len(contact.key_fields) > 0
-        assert len(contact.default_search_fields) > 0
-        assert len(contact.required_fields) > 0
-        assert len(contact.text_search_fields) > 0
 
-    def test_contact_key_fields_have_type_and_description(self):
-        """Each contact key field should have type and description."""
-        contact = ENTITY_REGISTRY["contact"]
-        for field_name, field_info in contact.key_fields.items():
-            assert "type" in field_info, f"Missing type for {field_name}"
-            assert "description" in field_info, f"Missing description for {field_name}"
-
-    def test_contact_required_fields_in_key_fields(self):
-        """Contact required fields should be documented in key_fields."""
-        contact = ENTITY_REGISTRY["contact"]
-        for required in contact.required_fields:
-            assert required in contact.key_fields, \
-                f"Required field '{required}' not in key_fields"
-
-    # --- Employee entity tests ---
-
-    def test_employee_registered(self):
-        """Employee entity should be in the registry."""
-        assert "employee" in ENTITY_REGISTRY
-
-    def test_employee_config_fields(self):
-        """Employee config should have all required fields."""
-        employee = ENTITY_REGISTRY["employee"]
-        assert employee.key == "employee"
-        assert employee.key_plural == "employees"
-        assert employee.api_path == "/contacts.employees"
-        assert employee.display_name == "Employee"
-        assert employee.display_name_plural == "Employees"
-        assert len(employee.key_fields) > 0
-        assert len(employee.default_search_fields) > 0
-        assert len(employee.required_fields) > 0
-        assert len(employee.text_search_fields) > 0
-
-    def test_employee_key_fields_have_type_and_description(self):
-        """Each employee key field should have type and description."""
-        employee = ENTITY_REGISTRY["employee"]
-        for field_name, field_info in employee.key_fields.items():
-            assert "type" in field_info, f"Missing type for {field_name}"
-            assert "description" in field_info, f"Missing description for {field_name}"
-
-    def test_employee_required_fields_in_key_fields(self):
-        """Employee required fields should be documented in key_fields."""
-        employee = ENTITY_REGISTRY["employee"]
-        for required in employee.required_fields:
-            assert required in employee.key_fields, \
-                f"Required field '{required}' not in key_fields"
-
-    # --- Customer entity tests ---
-
-    def test_customer_registered(self):
-        """Customer entity should be in the registry."""
-        assert "customer" in ENTITY_REGISTRY
-
-    def test_customer_config_fields(self):
-        """Customer config should have all required fields."""
-        customer = ENTITY_REGISTRY["customer"]
-        assert customer.key == "customer"
-        assert customer.key_plural == "customers"
-        assert customer.api_path == "/contacts.customer"
-        assert customer.display_name == "Customer Contact"
-        assert customer.display_name_plural == "Customer Contacts"
-        assert len(customer.key_fields) > 0
-        assert len(customer.default_search_fields) > 0
-        assert len(customer.required_fields) > 0
-        assert len(customer.text_search_fields) > 0
+class TestEntityRegistry:
+    """Test the entity registry configuration."""
 
-    def test_customer_key_fields_have_type_and_description(self):
-        """Each customer key field should have type and description."""
-        customer = ENTITY_REGISTRY["customer"]
-        for field_name, field_info in customer.key_fields.items():
+    @pytest.mark.parametrize("key", ENTITY_KEYS)
+    def test_registered(self, key):
+        """Each expected entity should be in the registry."""
+        assert key in ENTITY_REGISTRY
+
+    @pytest.mark.parametrize(
+        "key,key_plural,api_path,display_name,display_name_plural",
+        ENTITY_CASES, ids=ENTITY_KEYS,
+    )
+    def test_config_fields(self, key, key_plural, api_path, display_name, display_name_plural):
+        """Entity config should have all required fields."""
+        entity = ENTITY_REGISTRY[key]
+        assert entity.key == key
+        assert entity.key_plural == key_plural
+        assert entity.api_path == api_path
+        assert entity.display_name == display_name
+        assert entity.display_name_plural == display_name_plural
+        assert len(entity.key_fields) > 0
+        assert len(entity.default_search_fields) > 0
+        assert len(entity.required_fields) > 0
+        assert len(entity.text_search_fields) > 0
+
+    def test_key_fields_have_type_and_description(self, entity):
+        """Each key field should have type and description."""
+        for field_name, field_info in entity.key_fields.items():
             assert "type" in field_info, f"Missing type for {field_name}"
             assert "description" in field_info, f"Missing description for {field_name}"
 
-    def test_customer_required_fields_in_key_fields(self):
-        """Customer required fields should be documented in key_fields."""
-        customer = ENTITY_REGISTRY["customer"]
-        for required in customer.required_fields:
-            assert required in customer.key_fields, \
+    def test_required_fields_in_key_fields(self, entity):
+        """Required fields should be documented in key_fields."""
+        for required in entity.required_fields:
+            assert required in entity.key_fields, \
                 f"Required field '{required}' not in key_fields"
 
-    # --- Contract Type entity tests ---
-
-    def test_contract_type_registered(self):
-        """Contract Type entity should be in the registry."""
-        assert "contract_type" in ENTITY_REGISTRY
-
-    def test_contract_type_config_fields(self):
-        """Contract Type config should have all required fields."""
-        ct = ENTITY_REGISTRY["contract_type"]
-        assert ct.key == "contract_type"
-        assert ct.key_plural == "contract_types"
-        assert ct.api_path == "/contract_type"
-        assert ct.display_name == "Contract Type"
-        assert ct.display_name_plural == "Contract Types"
-        assert len(ct.key_fields) > 0
-        assert len(ct.default_search_fields) > 0
-        assert len(ct.required_fields) > 0
-        assert len(ct.text_search_fields) > 0
-
-    def test_contract_type_key_fields_have_type_and_description(self):
-        """Each contract type key field should have type and description."""
-        ct = ENTITY_REGISTRY["contract_type"]
-        for field_name, field_info in ct.key_fields.items():
-            assert "type" in field_info, f"Missing type for {field_name}"
-            assert "description" in field_info, f"Missing description for {field_name}"
-
-    def test_contract_type_required_fields_in_key_fields(self):
-        """Contract Type required fields should be documented in key_fields."""
-        ct = ENTITY_REGISTRY["contract_type"]
-        for required in ct.required_fields:
-            assert required in ct.key_fields, \
-                f"Required field '{required}' not in key_fields"
+    def test_contract_default_search_fields_include_id(self):
+        """Default search fields should include 'id'."""
+        contract = ENTITY_REGISTRY["contract"]
+        assert "id" in contract.default_search_fields
 
     # --- Utility function tests ---
 
@@ -261,14 +98,8 @@ class TestEntityRegistry:
         with pytest.raises(ValueError, match="Unknown entity"):
             get_entity("nonexistent")
 
-    def test_list_entities(self):
+    def test_list_entities(self, all_entity_keys, entity_key_set):
         """list_entities should return all registered keys."""
-        entities = list_entities()
-        assert "contract" in entities
-        assert "company" in entities
-        assert "attachment" in entities
-        assert "contact" in entities
-        assert "employee" in entities
-        assert "customer" in entities
-        assert "contract_type" in entities
-        assert isinstance(entities, list)
+        missing = set(ENTITY_KEYS) - entity_key_set
+        assert not missing, f"Missing entities: {sorted(missing)}"
+        assert isinstance(all_entity_keys, list)
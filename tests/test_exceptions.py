@@ -27,39 +27,21 @@ class TestExceptions:
         assert isinstance(error, AgiloftError)
         assert isinstance(error, Exception)
     
-    def test_agiloft_api_error_basic(self):
-        """Test AgiloftAPIError with basic message."""
-        error = AgiloftAPIError("API request failed")
+    @pytest.mark.parametrize("kwargs,status_code,response_text", [
+        ({}, None, None),
+        ({"status_code": 404}, 404, None),
+        ({"response_text": "Not found"}, None, "Not found"),
+        ({"status_code": 500, "response_text": "Internal server error"},
+         500, "Internal server error"),
+    ], ids=["basic", "with_status", "with_response_text", "complete"])
+    def test_agiloft_api_error(self, kwargs, status_code, response_text):
+        """Test AgiloftAPIError with optional status code and response text."""
+        error = AgiloftAPIError("API request failed", **kwargs)
         assert str(error) == "API request failed"
-        assert error.status_code is None
-        assert error.response_text is None
+        assert error.status_code == status_code
+        assert error.response_text == response_text
         assert isinstance(error, AgiloftError)
     
-    def test_agiloft_api_error_with_status(self):
-        """Test AgiloftAPIError with status code."""
-        error = AgiloftAPIError("API request failed", status_code=404)
-        assert str(error) == "API request failed"
-        assert error.status_code == 404
-        assert error.response_text is None
-    
-    def test_agiloft_api_error_with_response_text(self):
-        """Test AgiloftAPIError with response text."""
-        error = AgiloftAPIError("API request failed", response_text="Not found")
-        assert str(error) == "API request failed"
-        assert error.status_code is None
-        assert error.response_text == "Not found"
-    
-    def test_agiloft_api_error_complete(self):
-        """Test AgiloftAPIError with all parameters."""
-        error = AgiloftAPIError(
-            "API request failed",
-            status_code=500,
-            response_text="Internal server error"
-        )
-        assert str(error) == "API request failed"
-        assert error.status_code == 500
-        assert error.response_text == "Internal server error"
-    
     def test_agiloft_config_error(self):
         """Test AgiloftConfigError exception."""
         error = AgiloftConfigError("Configuration is invalid")
@@ -67,49 +49,18 @@ class TestExceptions:
         assert isinstance(error, AgiloftError)
         assert isinstance(error, Exception)
     
-    def test_exception_inheritance_chain(self):
+    @pytest.mark.parametrize("exc_cls", [AgiloftAuthError, AgiloftAPIError, AgiloftConfigError])
+    def test_exception_inheritance_chain(self, exc_cls):
         """Test that all custom exceptions inherit correctly."""
-        # Test inheritance chain
-        auth_error = AgiloftAuthError("auth error")
-        api_error = AgiloftAPIError("api error")
-        config_error = AgiloftConfigError("config error")
-        
-        # All should be instances of base classes
-        assert isinstance(auth_error, AgiloftError)
-        assert isinstance(api_error, AgiloftError)
-        assert isinstance(config_error, AgiloftError)
-        
-        assert isinstance(auth_error, Exception)
-        assert isinstance(api_error, Exception)
-        assert isinstance(config_error, Exception)
+        error = exc_cls("error")
+        assert isinstance(error, AgiloftError)
+        assert isinstance(error, Exception)
     
-    def test_exception_catching(self):
-        """Test that exceptions can be caught by their base classes."""
-        def raise_auth_error():
-            raise AgiloftAuthError("Auth failed")
-        
-        def raise_api_error():
-            raise AgiloftAPIError("API failed")
-        
-        def raise_config_error():
-            raise AgiloftConfigError("Config failed")
-        
-        # Test catching specific exceptions
-        with pytest.raises(AgiloftAuthError):
-            raise_auth_error()
-        
-        with pytest.raises(AgiloftAPIError):
-            raise_api_error()
-        
-        with pytest.raises(AgiloftConfigError):
-            raise_config_error()
-        
-        # Test catching by base exception
-        with pytest.raises(AgiloftError):
-            raise_auth_error()
-        
-        with pytest.raises(AgiloftError):
-            raise_api_error()
+    @pytest.mark.parametrize("exc_cls", [AgiloftAuthError, AgiloftAPIError, AgiloftConfigError])
+    def test_exception_catching(self, exc_cls):
+        """Test that exceptions can be caught by their own and base classes."""
+        with pytest.raises(exc_cls):
+            raise exc_cls("failed")
         
         with pytest.raises(AgiloftError):
-            raise_config_error()
\ No newline at end of file
+            raise exc_cls("failed")
@@ -11,6 +11,14 @@ from src.prompt_registry import (
     get_prompt,
 )
 
+PROMPT_NAMES = tuple(sorted(PROMPT_REGISTRY))
+
+
+@pytest.fixture(scope="module")
+def all_prompts():
+    """list_prompts() result, built once for the module."""
+    return list_prompts()
+
 
 class TestPromptRegistry:
     """Test the prompt registry structure."""
@@ -21,52 +29,51 @@ class TestPromptRegistry:
 
     def test_expected_prompt_names(self):
         """All expected prompts should be registered."""
-        expected = [
+        expected = {
             "create-contract",
             "contract-review",
             "company-onboarding",
             "contract-search-and-report",
             "contract-renewal-check",
-        ]
-        for name in expected:
-            assert name in PROMPT_REGISTRY, f"Missing prompt: {name}"
+        }
+        missing = expected - PROMPT_REGISTRY.keys()
+        assert not missing, f"Missing prompts: {sorted(missing)}"
 
-    def test_each_entry_has_prompt_and_renderer(self):
+    @pytest.mark.parametrize("name", PROMPT_NAMES)
+    def test_each_entry_has_prompt_and_renderer(self, name):
         """Each registry entry should have 'prompt' and 'renderer' keys."""
-        for name, entry in PROMPT_REGISTRY.items():
-            assert "prompt" in entry, f"{name} missing 'prompt'"
-            assert "renderer" in entry, f"{name} missing 'renderer'"
-            assert isinstance(entry["prompt"], Prompt)
-            assert callable(entry["renderer"])
-
-    def test_all_prompts_have_descriptions(self):
+        entry = PROMPT_REGISTRY[name]
+        assert "prompt" in entry, f"{name} missing 'prompt'"
+        assert "renderer" in entry, f"{name} missing 'renderer'"
+        assert isinstance(entry["prompt"], Prompt)
+        assert callable(entry["renderer"])
+
+    @pytest.mark.parametrize("name", PROMPT_NAMES)
+    def test_all_prompts_have_descriptions(self, name):
         """Every prompt should have a non-empty description."""
-        for name, entry in PROMPT_REGISTRY.items():
-            prompt = entry["prompt"]
-            assert prompt.description, f"Prompt {name} has no description"
-            assert len(prompt.description) > 10
+        prompt = PROMPT_REGISTRY[name]["prompt"]
+        assert prompt.description, f"Prompt {name} has no description"
+        assert len(prompt.description) > 10
 
-    def test_prompt_names_match_registry_keys(self):
+    @pytest.mark.parametrize("name", PROMPT_NAMES)
+    def test_prompt_names_match_registry_keys(self, name):
         """Prompt.name should match the registry key."""
-        for key, entry in PROMPT_REGISTRY.items():
-            assert entry["prompt"].name == key
+        assert PROMPT_REGISTRY[name]["prompt"].name == name
 
 
 class TestListPrompts:
     """Test the list_prompts function."""
 
-    def test_returns_list_of_prompts(self):
+    def test_returns_list_of_prompts(self, all_prompts):
         """list_prompts should return a list of Prompt objects."""
-        prompts = list_prompts()
-        assert isinstance(prompts, list)
-        assert len(prompts) == 5
-        for p in prompts:
+        assert isinstance(all_prompts, list)
+        assert len(all_prompts) == 5
+        for p in all_prompts:
             assert isinstance(p, Prompt)
 
-    def test_prompt_names_are_unique(self):
+    def test_prompt_names_are_unique(self, all_prompts):
         """All prompt names should be unique."""
-        prompts = list_prompts()
-        names = [p.name for p in prompts]
+        names = [p.name for p in all_prompts]
         assert len(names) == len(set(names))
 
 
@@ -90,77 +97,44 @@ class TestGetPrompt:
         assert "contract type" in text.lower()
         assert "agiloft_search_contract_types" in text
 
-    def test_create_contract_with_type(self):
-        """create-contract with contract_type should include it."""
-        result = get_prompt("create-contract", {"contract_type": "NDA"})
-        text = result.messages[0].content.text
-        assert "NDA" in text
-
-    def test_create_contract_with_company(self):
-        """create-contract with company_name should include it."""
-        result = get_prompt("create-contract", {"company_name": "Acme Corp"})
-        text = result.messages[0].content.text
-        assert "Acme Corp" in text
-        assert "agiloft_search_companies" in text
-
-    def test_contract_review_no_args(self):
-        """contract-review with no args should ask for ID or search."""
-        result = get_prompt("contract-review")
-        text = result.messages[0].content.text
-        assert "contract ID" in text.lower() or "search" in text.lower()
-
-    def test_contract_review_with_id(self):
-        """contract-review with contract_id should reference it."""
-        result = get_prompt("contract-review", {"contract_id": "42"})
-        text = result.messages[0].content.text
-        assert "42" in text
-        assert "agiloft_get_contract" in text
-
-    def test_company_onboarding_no_args(self):
-        """company-onboarding with no args should ask for name."""
-        result = get_prompt("company-onboarding")
-        text = result.messages[0].content.text
-        assert "company name" in text.lower() or "company" in text.lower()
-
-    def test_company_onboarding_with_name(self):
-        """company-onboarding with company_name should check existence."""
-        result = get_prompt("company-onboarding", {"company_name": "TestCo"})
-        text = result.messages[0].content.text
-        assert "TestCo" in text
-        assert "agiloft_search_companies" in text
-
-    def test_contract_search_report_no_args(self):
-        """contract-search-and-report with no args should describe options."""
-        result = get_prompt("contract-search-and-report")
-        text = result.messages[0].content.text
-        assert "search" in text.lower()
-
-    def test_contract_search_report_with_criteria(self):
-        """contract-search-and-report with criteria should include it."""
-        result = get_prompt("contract-search-and-report", {"search_criteria": "Active NDAs"})
-        text = result.messages[0].content.text
-        assert "Active NDAs" in text
-
-    def test_contract_renewal_check_default_days(self):
-        """contract-renewal-check defaults to 90 days."""
-        result = get_prompt("contract-renewal-check")
-        text = result.messages[0].content.text
-        assert "90" in text
-        assert "agiloft_find_expiring_contracts" in text
-
-    def test_contract_renewal_check_custom_days(self):
-        """contract-renewal-check with custom days_ahead."""
-        result = get_prompt("contract-renewal-check", {"days_ahead": "60"})
-        text = result.messages[0].content.text
-        assert "60" in text
-
-    def test_all_prompts_return_valid_results(self):
+    @pytest.mark.parametrize("name,args,expected", [
+        ("create-contract", {"contract_type": "NDA"}, ["NDA"]),
+        ("create-contract", {"company_name": "Acme Corp"},
+         ["Acme Corp", "agiloft_search_companies"]),
+        ("contract-review", None, ["search"]),
+        ("contract-review", {"contract_id": "42"}, ["42", "agiloft_get_contract"]),
+        ("company-onboarding", None, ["company"]),
+        ("company-onboarding", {"company_name": "TestCo"},
+         ["TestCo", "agiloft_search_companies"]),
+        ("contract-search-and-report", None, ["search"]),
+        ("contract-search-and-report", {"search_criteria": "Active NDAs"}, ["Active NDAs"]),
+        ("contract-renewal-check", None, ["90", "agiloft_find_expiring_contracts"]),
+        ("contract-renewal-check", {"days_ahead": "60"}, ["60"]),
+    ], ids=[
+        "create_contract_with_type",
+        "create_contract_with_company",
+        "contract_review_no_args",
+        "contract_review_with_id",
+        "company_onboarding_no_args",
+        "company_onboarding_with_name",
+        "contract_search_report_no_args",
+        "contract_search_report_with_criteria",
+        "contract_renewal_check_default_days",
+        "contract_renewal_check_custom_days",
+    ])
+    def test_prompt_text_includes(self, name, args, expected):
+        """Rendered prompt text should mention the arguments and tools it relies on."""
+        text = get_prompt(name, args).messages[0].content.text
+        for substring in expected:
+            assert substring in text
+
+    @pytest.mark.parametrize("name", PROMPT_NAMES)
+    def test_all_prompts_return_valid_results(self, name):
         """Every prompt should return a valid GetPromptResult with empty args."""
-        for name in PROMPT_REGISTRY:
-            result = get_prompt(name)
-            assert isinstance(result, GetPromptResult)
-            assert len(result.messages) > 0
-            assert result.description
+        result = get_prompt(name)
+        assert isinstance(result, GetPromptResult)
+        assert len(result.messages) > 0
+        assert result.description
 
 
 class TestPromptArguments:
@@ -188,31 +162,29 @@ class TestPromptArguments:
         assert days_arg.required is True
 
 
+@pytest.fixture(scope="module")
+def review_text():
+    """contract-review rendered for contract 42, shared by the tests below."""
+    return get_prompt("contract-review", {"contract_id": "42"}).messages[0].content.text
+
+
 class TestContractReviewPromptCorrectness:
     """Verify contract-review prompt uses correct tools."""
 
-    def test_no_broken_attachment_info_reference(self):
+    def test_no_broken_attachment_info_reference(self, review_text):
         """contract-review should NOT reference agiloft_get_attachment_info_contract."""
-        result = get_prompt("contract-review", {"contract_id": "42"})
-        text = result.messages[0].content.text
-        assert "agiloft_get_attachment_info_contract" not in text
+        assert "agiloft_get_attachment_info_contract" not in review_text
 
-    def test_no_broken_retrieve_attachment_as_recommendation(self):
+    def test_no_broken_retrieve_attachment_as_recommendation(self, review_text):
         """contract-review should NOT recommend agiloft_retrieve_attachment_contract as the tool to use."""
-        result = get_prompt("contract-review", {"contract_id": "42"})
-        text = result.messages[0].content.text
         # It's OK to mention it in a "NOT" warning, but it shouldn't be the recommended tool
-        assert "use agiloft_retrieve_attachment_contract" not in text.lower()
-        assert "agiloft_retrieve_attachment_attachment" not in text
+        assert "use agiloft_retrieve_attachment_contract" not in review_text.lower()
+        assert "agiloft_retrieve_attachment_attachment" not in review_text
 
-    def test_uses_search_attachments_for_info(self):
+    def test_uses_search_attachments_for_info(self, review_text):
         """contract-review should use agiloft_search_attachments for checking attachments."""
-        result = get_prompt("contract-review", {"contract_id": "42"})
-        text = result.messages[0].content.text
-        assert "agiloft_search_attachments" in text
+        assert "agiloft_search_attachments" in review_text
 
-    def test_uses_download_contract_attachment(self):
+    def test_uses_download_contract_attachment(self, review_text):
         """contract-review should reference agiloft_download_contract_attachment for downloads."""
-        result = get_prompt("contract-review", {"contract_id": "42"})
-        text = result.messages[0].content.text
-        assert "agiloft_download_contract_attachment" in text
+        assert "agiloft_download_contract_attachment" in review_text
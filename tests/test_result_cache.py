@@ -0,0 +1,87 @@
+"""
+Tests for the read result TTL cache.
+"""
+
+from unittest.mock import patch
+
+from src.result_cache import (
+    WORKFLOW_CACHE_GROUP,
+    TTLCache,
+    configure_result_cache,
+    invalidate_entity,
+    reference_cache,
+    result_cache,
+)
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_disabled_by_default(self):
+        """A zero TTL cache should store nothing."""
+        cache = TTLCache()
+        cache.set(("contract", 1), "value")
+
+        assert cache.enabled is False
+        assert cache.get(("contract", 1)) is None
+        assert len(cache) == 0
+
+    def test_set_and_get(self):
+        cache = TTLCache(ttl=5)
+        cache.set(("contract", 1), {"id": 1})
+
+        assert cache.get(("contract", 1)) == {"id": 1}
+
+    def test_entries_expire(self):
+        """Entries should be dropped once their TTL has elapsed."""
+        cache = TTLCache(ttl=5)
+        with patch("src.result_cache.time.monotonic", return_value=100.0):
+            cache.set(("contract", 1), "value")
+        with patch("src.result_cache.time.monotonic", return_value=104.9):
+            assert cache.get(("contract", 1)) == "value"
+        with patch("src.result_cache.time.monotonic", return_value=105.0):
+            assert cache.get(("contract", 1), "miss") == "miss"
+        assert len(cache) == 0
+
+    def test_maxsize_drops_oldest(self):
+        cache = TTLCache(maxsize=2, ttl=5)
+        for i in range(3):
+            cache.set(("contract", i), i)
+
+        assert cache.get(("contract", 0)) is None
+        assert cache.get(("contract", 1)) == 1
+        assert cache.get(("contract", 2)) == 2
+
+    def test_evict_group(self):
+        """evict should only drop keys whose first element matches."""
+        cache = TTLCache(ttl=5)
+        cache.set(("contract", "get", 1), "a")
+        cache.set(("contract", "search", "q"), "b")
+        cache.set(("company", "get", 1), "c")
+
+        cache.evict("contract")
+
+        assert len(cache) == 1
+        assert cache.get(("company", "get", 1)) == "c"
+
+
+class TestInvalidateEntity:
+    """Tests for write-time eviction across the shared caches."""
+
+    def test_drops_entity_and_workflow_entries(self):
+        configure_result_cache(5)
+        try:
+            result_cache.set(("contract", "get", 1), "a")
+            result_cache.set(("company", "get", 1), "b")
+            result_cache.set((WORKFLOW_CACHE_GROUP, "summary", "{}"), "c")
+            reference_cache.set(("contract", "types"), "d")
+
+            invalidate_entity("contract")
+
+            assert result_cache.get(("contract", "get", 1)) is None
+            assert result_cache.get((WORKFLOW_CACHE_GROUP, "summary", "{}")) is None
+            assert reference_cache.get(("contract", "types")) is None
+            assert result_cache.get(("company", "get", 1)) == "b"
+        finally:
+            configure_result_cache(0)
+            reference_cache.clear()
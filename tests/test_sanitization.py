@@ -0,0 +1,24 @@
+"""
+Unit tests for sanitization.py
+"""
+
+from src.sanitization import strip_empty_values
+
+
+class TestStripEmptyValues:
+    """Tests for empty value stripping before create/update."""
+
+    def test_drops_none_and_empty_string(self):
+        data = {"a": "x", "b": None, "c": "", "d": 1}
+        assert strip_empty_values(data) == {"a": "x", "d": 1}
+
+    def test_keeps_falsy_non_empty_values(self):
+        data = {"zero": 0, "false": False, "empty_list": []}
+        assert strip_empty_values(data) == data
+
+    def test_empty_input(self):
+        assert strip_empty_values({}) == {}
+
+    def test_nothing_to_strip_returns_input(self):
+        data = {"a": "x", "b": 0}
+        assert strip_empty_values(data) is data
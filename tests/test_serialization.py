@@ -0,0 +1,67 @@
+"""
+Unit tests for serialization.py
+"""
+
+import json
+from datetime import date, datetime
+from unittest.mock import patch
+
+from src import serialization
+from src.serialization import dumps
+
+
+class TestDumps:
+    """Tests for response JSON encoding."""
+
+    def test_round_trips(self):
+        payload = {"success": True, "data": [{"id": 1, "name": "Acme"}], "count": 1}
+        assert json.loads(dumps(payload)) == payload
+
+    def test_compact_by_default(self):
+        assert dumps({"a": 1, "b": [1, 2]}) == '{"a":1,"b":[1,2]}'
+
+    def test_indented(self):
+        assert dumps({"a": 1}, compact=False) == '{\n  "a": 1\n}'
+
+    def test_set_compact(self):
+        try:
+            serialization.set_compact(False)
+            assert dumps({"a": 1}) == '{\n  "a": 1\n}'
+        finally:
+            serialization.set_compact(True)
+
+    def test_unknown_types_use_str(self):
+        assert json.loads(dumps({"d": date(2026, 1, 31)})) == {"d": "2026-01-31"}
+
+    def test_non_string_keys(self):
+        assert json.loads(dumps({1: "x"})) == {"1": "x"}
+
+    def test_wide_ints_fall_back_to_stdlib(self):
+        assert json.loads(dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+    def test_stdlib_fallback_matches(self):
+        payload = {"success": False, "error": "boom", "data": [1, 2], "name": "Café ✓"}
+        with patch.object(serialization, "orjson", None):
+            assert dumps(payload) == json.dumps(
+                payload, separators=(",", ":"), ensure_ascii=False
+            )
+            assert dumps(payload, compact=False) == json.dumps(
+                payload, indent=2, ensure_ascii=False
+            )
+
+    def test_datetimes_match_across_encoders(self):
+        """Both encoders should write datetimes as ISO 8601 with a 'T'."""
+        payload = {"at": datetime(2026, 1, 31, 9, 30)}
+        expected = {"at": "2026-01-31T09:30:00"}
+
+        assert json.loads(dumps(payload)) == expected
+        with patch.object(serialization, "orjson", None):
+            assert json.loads(dumps(payload)) == expected
+
+    def test_non_ascii_text_matches_across_encoders(self):
+        """Both encoders should write non-ASCII text as raw UTF-8."""
+        payload = {"n": "Café ✓"}
+
+        assert dumps(payload) == '{"n":"Café ✓"}'
+        with patch.object(serialization, "orjson", None):
+            assert dumps(payload) == '{"n":"Café ✓"}'
@@ -5,11 +5,13 @@ Tests the tool dispatch mechanism through dispatch_tool_call,
 which is how server.py routes all tool calls.
 """
 
+import asyncio
 import json
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from mcp.types import TextContent
-from src.tool_handlers import dispatch_tool_call
+from src.tool_handlers import build_handler_table, dispatch_tool_call, handle_get
 from src.tool_generator import generate_tools
 from src.entity_registry import ENTITY_REGISTRY
 
@@ -27,6 +29,12 @@ def tool_dispatch():
     return dispatch
 
 
+@pytest.fixture
+def handler_table(tool_dispatch):
+    """The tool_name -> (entity, handler) table the server dispatches through."""
+    return build_handler_table(tool_dispatch)
+
+
 class TestToolDispatch:
     """Test that tool names are generated correctly and dispatch works."""
 
@@ -174,7 +182,7 @@ class TestSearchHandler:
     """Test search tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_search_natural_language(self, mock_agiloft_client, tool_dispatch):
+    async def test_search_natural_language(self, mock_agiloft_client, handler_table):
         """Test search with natural language query (sanitized)."""
         mock_agiloft_client.search_records.return_value = [
             {"id": 1, "contract_title1": "Test Contract"}
@@ -184,7 +192,7 @@ class TestSearchHandler:
 
         result = await dispatch_tool_call(
             "agiloft_search_contracts", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         assert len(result) == 1
@@ -202,7 +210,7 @@ class TestSearchHandler:
         assert "company_name~='test contracts'" in queries_sent
 
     @pytest.mark.asyncio
-    async def test_search_structured_query(self, mock_agiloft_client, tool_dispatch):
+    async def test_search_structured_query(self, mock_agiloft_client, handler_table):
         """Test search with structured query passed through as-is."""
         mock_agiloft_client.search_records.return_value = [
             {"id": 1, "status": "Active"}
@@ -212,7 +220,7 @@ class TestSearchHandler:
 
         result = await dispatch_tool_call(
             "agiloft_search_contracts", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         # Verify structured query was passed through
@@ -220,7 +228,7 @@ class TestSearchHandler:
         assert call_args[0][1] == "status=Active AND contract_amount>1000"
 
     @pytest.mark.asyncio
-    async def test_search_sql_injection_sanitized(self, mock_agiloft_client, tool_dispatch):
+    async def test_search_sql_injection_sanitized(self, mock_agiloft_client, handler_table):
         """Test that SQL injection attempts are sanitized."""
         mock_agiloft_client.search_records.return_value = []
 
@@ -229,7 +237,7 @@ class TestSearchHandler:
 
         result = await dispatch_tool_call(
             "agiloft_search_contracts", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         call_args = mock_agiloft_client.search_records.call_args
@@ -240,7 +248,7 @@ class TestSearchHandler:
         assert ";" not in query
 
     @pytest.mark.asyncio
-    async def test_search_limit_applied(self, mock_agiloft_client, tool_dispatch):
+    async def test_search_limit_applied(self, mock_agiloft_client, handler_table):
         """Test that result limiting works."""
         mock_agiloft_client.search_records.return_value = [
             {"id": i} for i in range(100)
@@ -250,7 +258,7 @@ class TestSearchHandler:
 
         result = await dispatch_tool_call(
             "agiloft_search_contracts", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -258,7 +266,7 @@ class TestSearchHandler:
         assert len(response["data"]) == 5
 
     @pytest.mark.asyncio
-    async def test_search_error(self, mock_agiloft_client, tool_dispatch):
+    async def test_search_error(self, mock_agiloft_client, handler_table):
         """Test search error handling."""
         mock_agiloft_client.search_records.side_effect = Exception("Search failed")
 
@@ -266,19 +274,105 @@ class TestSearchHandler:
 
         result = await dispatch_tool_call(
             "agiloft_search_contracts", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
         assert response["success"] is False
         assert "Search failed" in response["error"]
 
+    @pytest.mark.asyncio
+    async def test_search_text_field_partial_failure(self, mock_agiloft_client, handler_table):
+        """Test that one failing text field doesn't discard the others' results."""
+        mock_agiloft_client.search_records.side_effect = [
+            [{"id": 1, "contract_title1": "Acme MSA"}],
+            Exception("company_name query failed"),
+        ]
+
+        arguments = {"query": "acme"}
+
+        result = await dispatch_tool_call(
+            "agiloft_search_contracts", arguments,
+            mock_agiloft_client, handler_table
+        )
+
+        response = json.loads(result[0].text)
+        assert response["success"] is True
+        assert response["count"] == 1
+        assert response["data"][0]["id"] == 1
+        # The failed field is reported rather than silently dropped
+        assert response["partial"] is True
+        assert len(response["warnings"]) == 1
+        assert "company_name" in response["warnings"][0]
+
+    @pytest.mark.asyncio
+    async def test_search_text_fields_deduplicated(self, mock_agiloft_client, handler_table):
+        """Test that records matched by several text fields appear once."""
+        mock_agiloft_client.search_records.side_effect = [
+            [{"id": 1}, {"id": 2}],
+            [{"id": 2}, {"id": 3}],
+        ]
+
+        arguments = {"query": "acme"}
+
+        result = await dispatch_tool_call(
+            "agiloft_search_contracts", arguments,
+            mock_agiloft_client, handler_table
+        )
+
+        response = json.loads(result[0].text)
+        assert [r["id"] for r in response["data"]] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_search_text_merge_stops_at_limit(self, mock_agiloft_client, handler_table):
+        """Test that merging stops once the limit is reached."""
+        mock_agiloft_client.search_records.side_effect = [
+            [{"id": 1}, {"id": 2}, {"id": 3}],
+            [{"id": 4}, {"id": 5}],
+        ]
+
+        arguments = {"query": "acme", "limit": 2}
+
+        result = await dispatch_tool_call(
+            "agiloft_search_contracts", arguments,
+            mock_agiloft_client, handler_table
+        )
+
+        response = json.loads(result[0].text)
+        assert [r["id"] for r in response["data"]] == [1, 2]
+        # limit is also passed down so the server truncates each field query
+        for call in mock_agiloft_client.search_records.call_args_list:
+            assert call[1]["limit"] == 2
+
+    @pytest.mark.asyncio
+    async def test_search_large_result_serialized_in_thread(self, mock_agiloft_client, handler_table):
+        """Test large result lists are serialized off the event loop."""
+        records = [{"id": i} for i in range(300)]
+        mock_agiloft_client.search_records.return_value = records
+
+        threads = []
+
+        def recording_dumps(obj):
+            threads.append(threading.current_thread())
+            return json.dumps(obj)
+
+        with patch("src.tool_handlers.dumps", side_effect=recording_dumps):
+            result = await dispatch_tool_call(
+                "agiloft_search_contracts", {"query": "id > 0", "limit": 500},
+                mock_agiloft_client, handler_table
+            )
+
+        assert threads and threads[0] is not threading.main_thread()
+        response = json.loads(result[0].text)
+        assert response["count"] == 300
+        assert response["data"] == records
+
 
 class TestGetHandler:
     """Test get tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_get_success(self, mock_agiloft_client, tool_dispatch):
+    async def test_get_success(self, mock_agiloft_client, handler_table):
         """Test successful get by ID."""
         mock_agiloft_client.get_record.return_value = {
             "id": 123, "contract_title1": "Test Contract"
@@ -288,7 +382,7 @@ class TestGetHandler:
 
         result = await dispatch_tool_call(
             "agiloft_get_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -297,7 +391,7 @@ class TestGetHandler:
         assert response["data"]["contract_title1"] == "Test Contract"
 
     @pytest.mark.asyncio
-    async def test_get_with_fields(self, mock_agiloft_client, tool_dispatch):
+    async def test_get_with_fields(self, mock_agiloft_client, handler_table):
         """Test get with field filtering."""
         mock_agiloft_client.get_record.return_value = {
             "id": 123, "contract_title1": "Test Contract"
@@ -307,7 +401,7 @@ class TestGetHandler:
 
         result = await dispatch_tool_call(
             "agiloft_get_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         mock_agiloft_client.get_record.assert_called_once_with(
@@ -315,7 +409,7 @@ class TestGetHandler:
         )
 
     @pytest.mark.asyncio
-    async def test_get_error(self, mock_agiloft_client, tool_dispatch):
+    async def test_get_error(self, mock_agiloft_client, handler_table):
         """Test get error handling."""
         mock_agiloft_client.get_record.side_effect = Exception("Not found")
 
@@ -323,19 +417,49 @@ class TestGetHandler:
 
         result = await dispatch_tool_call(
             "agiloft_get_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
         assert response["success"] is False
         assert response["record_id"] == 999
 
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_coalesced(self, mock_agiloft_client, handler_table):
+        """Test identical in-flight gets share a single API call."""
+        mock_agiloft_client.get_record.return_value = {"id": 123}
+
+        results = await asyncio.gather(*(
+            dispatch_tool_call(
+                "agiloft_get_contract", {"record_id": 123},
+                mock_agiloft_client, handler_table
+            )
+            for _ in range(3)
+        ))
+
+        mock_agiloft_client.get_record.assert_called_once_with("/contract", 123, None)
+        for result in results:
+            assert json.loads(result[0].text)["data"] == {"id": 123}
+
+    @pytest.mark.asyncio
+    async def test_sequential_gets_not_coalesced(self, mock_agiloft_client, handler_table):
+        """Test a completed get is not reused by later calls."""
+        mock_agiloft_client.get_record.return_value = {"id": 123}
+
+        for _ in range(2):
+            await dispatch_tool_call(
+                "agiloft_get_contract", {"record_id": 123},
+                mock_agiloft_client, handler_table
+            )
+
+        assert mock_agiloft_client.get_record.call_count == 2
+
 
 class TestCreateHandler:
     """Test create tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_create_success(self, mock_agiloft_client, tool_dispatch):
+    async def test_create_success(self, mock_agiloft_client, handler_table):
         """Test successful create."""
         mock_agiloft_client.create_record.return_value = {
             "success": True, "contract": {"id": 456}
@@ -345,7 +469,7 @@ class TestCreateHandler:
 
         result = await dispatch_tool_call(
             "agiloft_create_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -355,7 +479,7 @@ class TestCreateHandler:
         )
 
     @pytest.mark.asyncio
-    async def test_create_error(self, mock_agiloft_client, tool_dispatch):
+    async def test_create_error(self, mock_agiloft_client, handler_table):
         """Test create error handling."""
         mock_agiloft_client.create_record.side_effect = Exception("Validation failed")
 
@@ -363,7 +487,7 @@ class TestCreateHandler:
 
         result = await dispatch_tool_call(
             "agiloft_create_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -374,7 +498,7 @@ class TestUpdateHandler:
     """Test update tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_update_success(self, mock_agiloft_client, tool_dispatch):
+    async def test_update_success(self, mock_agiloft_client, handler_table):
         """Test successful update."""
         mock_agiloft_client.update_record.return_value = {"success": True}
 
@@ -382,7 +506,7 @@ class TestUpdateHandler:
 
         result = await dispatch_tool_call(
             "agiloft_update_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -397,7 +521,7 @@ class TestDeleteHandler:
     """Test delete tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_delete_success(self, mock_agiloft_client, tool_dispatch):
+    async def test_delete_success(self, mock_agiloft_client, handler_table):
         """Test successful delete."""
         mock_agiloft_client.delete_record.return_value = {"success": True}
 
@@ -405,7 +529,7 @@ class TestDeleteHandler:
 
         result = await dispatch_tool_call(
             "agiloft_delete_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -415,7 +539,7 @@ class TestDeleteHandler:
         )
 
     @pytest.mark.asyncio
-    async def test_delete_default_rule(self, mock_agiloft_client, tool_dispatch):
+    async def test_delete_default_rule(self, mock_agiloft_client, handler_table):
         """Test delete with default delete rule."""
         mock_agiloft_client.delete_record.return_value = {"success": True}
 
@@ -423,7 +547,7 @@ class TestDeleteHandler:
 
         await dispatch_tool_call(
             "agiloft_delete_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         mock_agiloft_client.delete_record.assert_called_once_with(
@@ -435,7 +559,7 @@ class TestUpsertHandler:
     """Test upsert tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_upsert_success(self, mock_agiloft_client, tool_dispatch):
+    async def test_upsert_success(self, mock_agiloft_client, handler_table):
         """Test successful upsert."""
         mock_agiloft_client.upsert_record.return_value = {"success": True}
 
@@ -446,7 +570,7 @@ class TestUpsertHandler:
 
         result = await dispatch_tool_call(
             "agiloft_upsert_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -462,7 +586,7 @@ class TestActionButtonHandler:
     """Test action button tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_action_button_success(self, mock_agiloft_client, tool_dispatch):
+    async def test_action_button_success(self, mock_agiloft_client, handler_table):
         """Test successful action button trigger."""
         mock_agiloft_client.trigger_action_button.return_value = {
             "success": True, "message": "Action button executed"
@@ -472,7 +596,7 @@ class TestActionButtonHandler:
 
         result = await dispatch_tool_call(
             "agiloft_action_button_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -484,7 +608,7 @@ class TestActionButtonHandler:
         )
 
     @pytest.mark.asyncio
-    async def test_action_button_error(self, mock_agiloft_client, tool_dispatch):
+    async def test_action_button_error(self, mock_agiloft_client, handler_table):
         """Test action button error handling."""
         mock_agiloft_client.trigger_action_button.side_effect = Exception("Button not found")
 
@@ -492,7 +616,7 @@ class TestActionButtonHandler:
 
         result = await dispatch_tool_call(
             "agiloft_action_button_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -504,7 +628,7 @@ class TestEvaluateFormatHandler:
     """Test evaluate format tool dispatch."""
 
     @pytest.mark.asyncio
-    async def test_evaluate_format_success(self, mock_agiloft_client, tool_dispatch):
+    async def test_evaluate_format_success(self, mock_agiloft_client, handler_table):
         """Test successful formula evaluation."""
         mock_agiloft_client.evaluate_format.return_value = {
             "success": True, "result": "Calculated Value"
@@ -514,7 +638,7 @@ class TestEvaluateFormatHandler:
 
         result = await dispatch_tool_call(
             "agiloft_evaluate_format_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -526,7 +650,7 @@ class TestEvaluateFormatHandler:
         )
 
     @pytest.mark.asyncio
-    async def test_evaluate_format_error(self, mock_agiloft_client, tool_dispatch):
+    async def test_evaluate_format_error(self, mock_agiloft_client, handler_table):
         """Test evaluate format error handling."""
         mock_agiloft_client.evaluate_format.side_effect = Exception("Invalid formula")
 
@@ -534,7 +658,7 @@ class TestEvaluateFormatHandler:
 
         result = await dispatch_tool_call(
             "agiloft_evaluate_format_contract", arguments,
-            mock_agiloft_client, tool_dispatch
+            mock_agiloft_client, handler_table
         )
 
         response = json.loads(result[0].text)
@@ -546,10 +670,26 @@ class TestUnknownTool:
     """Test error handling for unknown tools."""
 
     @pytest.mark.asyncio
-    async def test_unknown_tool_raises(self, mock_agiloft_client, tool_dispatch):
+    async def test_unknown_tool_raises(self, mock_agiloft_client, handler_table):
         """Test that unknown tools raise ValueError."""
         with pytest.raises(ValueError, match="Unknown tool"):
             await dispatch_tool_call(
                 "agiloft_nonexistent_tool", {},
-                mock_agiloft_client, tool_dispatch
+                mock_agiloft_client, handler_table
             )
+
+
+class TestHandlerTable:
+    """Test the precomputed tool_name -> (entity, handler) table."""
+
+    def test_table_covers_every_tool(self, tool_dispatch):
+        table = build_handler_table(tool_dispatch)
+
+        assert set(table) == set(tool_dispatch)
+        entity, handler = table["agiloft_get_contract"]
+        assert entity.key == "contract"
+        assert handler is handle_get
+
+    def test_unknown_action_fails_at_build_time(self):
+        with pytest.raises(ValueError, match="Unknown action"):
+            build_handler_table({"agiloft_bogus_contract": ("contract", "bogus")})
@@ -2,12 +2,22 @@
 Unit tests for tool_handlers.py
 """
 
+import asyncio
+import base64
 import json
 from unittest.mock import AsyncMock
 
 import pytest
 
-from src.tool_handlers import handle_retrieve_attachment
+from src.result_cache import configure_result_cache
+from src.tool_handlers import (
+    _sanitize_query_value,
+    handle_attach_file,
+    handle_get,
+    handle_retrieve_attachment,
+    handle_search,
+    handle_update,
+)
 from src.entity_registry import get_entity
 
 
@@ -28,6 +38,196 @@ def attachment_entity():
     return get_entity("attachment")
 
 
+class TestSanitizeQueryValue:
+    """Tests for query value sanitization."""
+
+    def test_doubles_single_quotes(self):
+        assert _sanitize_query_value("O'Brien") == "O''Brien"
+
+    def test_strips_comment_and_semicolon(self):
+        assert _sanitize_query_value("x; DROP TABLE t --") == "x DROP TABLE t "
+
+    def test_plain_text_unchanged(self):
+        assert _sanitize_query_value("Acme Corp") == "Acme Corp"
+
+    def test_single_hyphen_kept(self):
+        assert _sanitize_query_value("Smith-Jones") == "Smith-Jones"
+
+    @pytest.mark.parametrize("value", ["-;-", "';--", "a-;;-b", "---", "x;-;-y"])
+    def test_no_comment_marker_survives(self, value):
+        sanitized = _sanitize_query_value(value)
+        assert "--" not in sanitized
+        assert ";" not in sanitized
+
+    def test_repeated_values_are_cached(self):
+        _sanitize_query_value.cache_clear()
+        _sanitize_query_value("Acme Corp")
+        _sanitize_query_value("Acme Corp")
+        assert _sanitize_query_value.cache_info().hits == 1
+
+
+class TestResultCache:
+    """Tests for the get/search read cache."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self):
+        configure_result_cache(5)
+        yield
+        configure_result_cache(0)
+
+    @pytest.fixture
+    def contract(self):
+        return get_entity("contract")
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_served_from_cache(self, mock_client, contract):
+        mock_client.get_record.return_value = {"id": 1}
+
+        first = await handle_get(contract, {"record_id": 1}, mock_client)
+        second = await handle_get(contract, {"record_id": 1}, mock_client)
+
+        assert _parse(first) == _parse(second)
+        mock_client.get_record.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_no_cache_bypasses(self, mock_client, contract):
+        mock_client.get_record.return_value = {"id": 1}
+
+        await handle_get(contract, {"record_id": 1}, mock_client)
+        await handle_get(contract, {"record_id": 1, "no_cache": True}, mock_client)
+
+        assert mock_client.get_record.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_served_from_cache(self, mock_client, contract):
+        mock_client.search_records.return_value = [{"id": 1}]
+        arguments = {"query": "id=1"}
+
+        await handle_search(contract, arguments, mock_client)
+        data = _parse(await handle_search(contract, arguments, mock_client))
+
+        assert data["data"] == [{"id": 1}]
+        mock_client.search_records.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_partial_search_not_cached(self, mock_client, contract):
+        """A search with a failed text field should not be served from cache."""
+        mock_client.search_records.side_effect = [
+            [{"id": 1}], Exception("company_name query failed"),
+            [{"id": 1}], [{"id": 2}],
+        ]
+        arguments = {"query": "acme"}
+
+        first = _parse(await handle_search(contract, arguments, mock_client))
+        second = _parse(await handle_search(contract, arguments, mock_client))
+
+        assert first["partial"] is True
+        assert mock_client.search_records.call_count == 4
+        assert "partial" not in second
+        assert [r["id"] for r in second["data"]] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_write_evicts_entity(self, mock_client, contract):
+        """A write should make the next read go back to the API."""
+        mock_client.get_record.return_value = {"id": 1}
+        mock_client.update_record.return_value = {"id": 1}
+
+        await handle_get(contract, {"record_id": 1}, mock_client)
+        await handle_update(contract, {"record_id": 1, "data": {"a": "b"}}, mock_client)
+        await handle_get(contract, {"record_id": 1}, mock_client)
+
+        assert mock_client.get_record.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_read_during_write_not_left_cached(self, mock_client, contract):
+        """A read that completes while a write is pending should not outlive it."""
+        write_started = asyncio.Event()
+        finish_write = asyncio.Event()
+
+        async def update_record(*args):
+            write_started.set()
+            await finish_write.wait()
+            return {"id": 1}
+
+        mock_client.get_record.return_value = {"id": 1, "a": "old"}
+        mock_client.update_record.side_effect = update_record
+
+        write = asyncio.ensure_future(
+            handle_update(contract, {"record_id": 1, "data": {"a": "new"}}, mock_client)
+        )
+        await write_started.wait()
+        await handle_get(contract, {"record_id": 1}, mock_client)
+        finish_write.set()
+        await write
+
+        mock_client.get_record.return_value = {"id": 1, "a": "new"}
+        data = _parse(await handle_get(contract, {"record_id": 1}, mock_client))
+
+        assert data["data"]["a"] == "new"
+
+    @pytest.mark.asyncio
+    async def test_failed_write_evicts_entity(self, mock_client, contract):
+        """A write that errors may still have landed, so it evicts too."""
+        mock_client.get_record.return_value = {"id": 1}
+        mock_client.update_record.side_effect = Exception("timeout")
+
+        await handle_get(contract, {"record_id": 1}, mock_client)
+        await handle_update(contract, {"record_id": 1, "data": {"a": "b"}}, mock_client)
+        await handle_get(contract, {"record_id": 1}, mock_client)
+
+        assert mock_client.get_record.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, mock_client, contract):
+        mock_client.get_record.side_effect = [Exception("boom"), {"id": 1}]
+
+        first = await handle_get(contract, {"record_id": 1}, mock_client)
+        second = await handle_get(contract, {"record_id": 1}, mock_client)
+
+        assert _parse(first)["success"] is False
+        assert _parse(second)["success"] is True
+
+
+class TestHandleAttachFile:
+    """Tests for the attach_file handler."""
+
+    @pytest.mark.asyncio
+    async def test_decodes_and_uploads(self, mock_client, attachment_entity):
+        """Should decode base64 content and pass the bytes to the client."""
+        mock_client.attach_file.return_value = {"success": True}
+        arguments = {
+            "record_id": 612,
+            "field": "attached_file",
+            "file_name": "notes.txt",
+            "file_content_base64": base64.b64encode(b"hello").decode(),
+        }
+
+        result = await handle_attach_file(attachment_entity, arguments, mock_client)
+        data = _parse(result)
+
+        assert data["success"] is True
+        mock_client.attach_file.assert_called_once_with(
+            "/attachment", 612, "attached_file", "notes.txt", b"hello"
+        )
+        # The caller's arguments are left as they were
+        assert arguments["file_content_base64"] == base64.b64encode(b"hello").decode()
+
+    @pytest.mark.asyncio
+    async def test_invalid_base64(self, mock_client, attachment_entity):
+        """Should return an error without calling the client."""
+        result = await handle_attach_file(
+            attachment_entity,
+            {"record_id": 612, "field": "attached_file", "file_name": "x",
+             "file_content_base64": "not base64!"},
+            mock_client,
+        )
+        data = _parse(result)
+
+        assert data["success"] is False
+        assert "Invalid base64" in data["error"]
+        mock_client.attach_file.assert_not_called()
+
+
 class TestHandleRetrieveAttachment:
     """Tests for the retrieve_attachment handler."""
 
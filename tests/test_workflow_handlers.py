@@ -2,12 +2,17 @@
 Unit tests for workflow_handlers.py
 """
 
+import asyncio
 import json
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from src import serialization
+from src.result_cache import configure_result_cache, reference_cache
+from src.tool_handlers import handle_update
+from src.entity_registry import get_entity
 from src.workflow_handlers import (
     handle_preflight_create_contract,
     handle_create_contract_with_company,
@@ -16,8 +21,12 @@ from src.workflow_handlers import (
     handle_onboard_company_with_contact,
     handle_attach_file_to_contract,
     handle_download_contract_attachment,
+    build_workflow_handler_table,
     dispatch_workflow_call,
     WORKFLOW_HANDLERS,
+    CONTRACT_LINKED_FIELDS,
+    _build_expiring_query,
+    _ensure_linked_prefix,
 )
 
 
@@ -27,11 +36,47 @@ def mock_client():
     return AsyncMock()
 
 
+@pytest.fixture(autouse=True)
+def clear_reference_cache():
+    """Keep cached contract types from leaking between tests."""
+    reference_cache.clear()
+    yield
+    reference_cache.clear()
+
+
 def _parse(result):
     """Parse TextContent result to dict."""
     return json.loads(result[0].text)
 
 
+# ---------------------------------------------------------------------------
+# Tests: _ensure_linked_prefix
+# ---------------------------------------------------------------------------
+
+class TestEnsureLinkedPrefix:
+
+    def test_adds_missing_prefix_on_copy(self):
+        data = {"contract_type": "NDA", "company_name": ":Acme", "title": "X"}
+
+        result = _ensure_linked_prefix(data, CONTRACT_LINKED_FIELDS)
+
+        assert result == {"contract_type": ":NDA", "company_name": ":Acme", "title": "X"}
+        assert data["contract_type"] == "NDA"
+
+    def test_unchanged_data_returned_as_is(self):
+        data = {"contract_type": ":NDA", "title": "X", "internal_contract_owner": ""}
+
+        assert _ensure_linked_prefix(data, CONTRACT_LINKED_FIELDS) is data
+
+    def test_inplace(self):
+        data = {"internal_contract_owner": "Jane"}
+
+        result = _ensure_linked_prefix(data, CONTRACT_LINKED_FIELDS, inplace=True)
+
+        assert result is data
+        assert data["internal_contract_owner"] == ":Jane"
+
+
 # ---------------------------------------------------------------------------
 # Tests: preflight_create_contract
 # ---------------------------------------------------------------------------
@@ -124,6 +169,120 @@ class TestPreflightCreateContract:
 
         assert any("mismatch" in w.lower() for w in data["warnings"])
 
+    @pytest.mark.asyncio
+    async def test_contract_types_cached(self, mock_client):
+        """Repeated preflights should reuse the cached contract type list."""
+        mock_client.search_records.return_value = [
+            {"id": 1, "contract_type": "NDA", "party_type": "Customer"},
+        ]
+
+        await handle_preflight_create_contract({}, mock_client)
+        result = await handle_preflight_create_contract({}, mock_client)
+
+        assert len(_parse(result)["data"]["available_contract_types"]) == 1
+        mock_client.search_records.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self, mock_client):
+        mock_client.search_records.return_value = [{"id": 1, "contract_type": "NDA"}]
+
+        await asyncio.gather(*(
+            handle_preflight_create_contract({}, mock_client) for _ in range(3)
+        ))
+
+        mock_client.search_records.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_contract_type_write_evicts_cache(self, mock_client):
+        """Updating a contract type through the entity tools should evict it."""
+        mock_client.search_records.return_value = [{"id": 1, "contract_type": "NDA"}]
+
+        await handle_preflight_create_contract({}, mock_client)
+        await handle_update(
+            get_entity("contract_type"), {"record_id": 1, "data": {"status": "Inactive"}},
+            mock_client,
+        )
+        await handle_preflight_create_contract({}, mock_client)
+
+        assert mock_client.search_records.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_quotes_escaped_in_queries(self, mock_client):
+        """Apostrophes in names should be doubled inside query literals."""
+        mock_client.search_records.return_value = []
+
+        await handle_preflight_create_contract(
+            {"contract_type": "Buyer's NDA", "company_name": "O'Brien Ltd"}, mock_client
+        )
+
+        queries = [c[0][1] for c in mock_client.search_records.call_args_list]
+        assert "contract_type='Buyer''s NDA' AND status=Active" in queries
+        assert "company_name~='O''Brien Ltd'" in queries
+
+    @pytest.mark.asyncio
+    async def test_type_and_company_lookups_overlap(self, mock_client):
+        """Type and company lookups should be in flight at the same time."""
+        company_started = asyncio.Event()
+
+        async def search(api_path, query, fields, **kwargs):
+            if api_path == "/contract_type":
+                # Would time out if the company lookup waited for this one
+                await asyncio.wait_for(company_started.wait(), timeout=1)
+                return [{"id": 1, "contract_type": "NDA", "party_type": "Customer"}]
+            company_started.set()
+            return [{"id": 10, "company_name": "Acme", "type_of_company": "Customer", "status": "Active"}]
+
+        mock_client.search_records.side_effect = search
+
+        result = await handle_preflight_create_contract(
+            {"contract_type": "NDA", "company_name": "Acme"}, mock_client
+        )
+        data = _parse(result)
+
+        assert data["data"]["ready_to_create"] is True
+        assert data["data"]["company"]["id"] == 10
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_cancels_sibling(self, mock_client):
+        """If the type lookup fails, the in-flight company lookup is cancelled."""
+        company_cancelled = asyncio.Event()
+
+        async def search(api_path, query, fields, **kwargs):
+            if api_path == "/contract_type":
+                await asyncio.sleep(0)
+                raise Exception("API down")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                company_cancelled.set()
+                raise
+
+        mock_client.search_records.side_effect = search
+
+        result = await handle_preflight_create_contract(
+            {"contract_type": "NDA", "company_name": "Acme"}, mock_client
+        )
+        await asyncio.wait_for(company_cancelled.wait(), timeout=1)
+
+        assert _parse(result)["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_invalid_type_with_company(self, mock_client):
+        """Invalid type should still fall back to active types when a company is given."""
+        mock_client.search_records.side_effect = [
+            [],  # type not found
+            [{"id": 10, "company_name": "Acme", "type_of_company": "Customer", "status": "Active"}],
+            [{"id": 1, "contract_type": "NDA", "party_type": "Customer"}],  # fallback
+        ]
+
+        result = await handle_preflight_create_contract(
+            {"contract_type": "InvalidType", "company_name": "Acme"}, mock_client
+        )
+        data = _parse(result)
+
+        assert data["data"]["ready_to_create"] is False
+        assert data["data"]["available_contract_types"][0]["contract_type"] == "NDA"
+
     @pytest.mark.asyncio
     async def test_api_error(self, mock_client):
         """API error should return workflow error."""
@@ -245,11 +404,14 @@ class TestGetContractSummary:
             "contract_amount": 50000, "internal_contract_owner": "John",
             "date_signed": "2024-01-01",
         }
-        # First call: company search, Second call: attachment search
-        mock_client.search_records.side_effect = [
-            [{"id": 10, "company_name": "Acme", "type_of_company": "Customer", "status": "Active"}],
-            [{"id": 501, "title": "doc.pdf", "status": "Active"}, {"id": 502, "title": "terms.pdf", "status": "Active"}],
-        ]
+        # Company and attachment searches overlap, so answer by table
+        search_results = {
+            "/company": [{"id": 10, "company_name": "Acme", "type_of_company": "Customer", "status": "Active"}],
+            "/attachment": [{"id": 501, "title": "doc.pdf", "status": "Active"}, {"id": 502, "title": "terms.pdf", "status": "Active"}],
+        }
+        mock_client.search_records.side_effect = (
+            lambda api_path, *args, **kwargs: search_results[api_path]
+        )
 
         result = await handle_get_contract_summary(
             {"contract_id": 1}, mock_client,
@@ -265,6 +427,37 @@ class TestGetContractSummary:
         assert any("expires" in issue.lower() or "urgent" in issue.lower()
                     for issue in data["data"].get("health_issues", []))
 
+    @pytest.mark.asyncio
+    async def test_cancel_during_company_lookup_cancels_attachment_search(self, mock_client):
+        """Cancelling mid-summary should not orphan the attachment search."""
+        mock_client.get_record.return_value = {"id": 1, "company_name": "Acme"}
+        company_started = asyncio.Event()
+        attach_cancelled = asyncio.Event()
+
+        async def search_records(api_path, *args, **kwargs):
+            if api_path == "/company":
+                company_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                if api_path == "/attachment":
+                    attach_cancelled.set()
+                raise
+
+        mock_client.search_records.side_effect = search_records
+        # Call the handler itself: the cache wrapper shields the run from
+        # its callers, so cancel the run directly.
+        summary = asyncio.ensure_future(
+            handle_get_contract_summary.__wrapped__({"contract_id": 1}, mock_client)
+        )
+        await company_started.wait()
+        summary.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await summary
+        await asyncio.sleep(0)
+
+        assert attach_cancelled.is_set()
+
     @pytest.mark.asyncio
     async def test_missing_fields_flagged(self, mock_client):
         """Missing key fields should create health issues."""
@@ -297,11 +490,53 @@ class TestGetContractSummary:
 
         assert data["success"] is False
 
+    @pytest.mark.asyncio
+    async def test_attachment_search_overlaps_contract_fetch(self, mock_client):
+        """Attachment search should start before the contract fetch finishes."""
+        attachments_started = asyncio.Event()
+
+        async def get_record(*args, **kwargs):
+            await asyncio.wait_for(attachments_started.wait(), timeout=1)
+            return {"id": 1, "contract_title1": "Test"}
+
+        async def search_records(api_path, *args, **kwargs):
+            attachments_started.set()
+            return [{"id": 501}] if api_path == "/attachment" else []
+
+        mock_client.get_record.side_effect = get_record
+        mock_client.search_records.side_effect = search_records
+
+        result = await handle_get_contract_summary(
+            {"contract_id": 1}, mock_client,
+        )
+        data = _parse(result)
+
+        assert data["success"] is True
+        assert data["data"]["attachments"]["count"] == 1
+
 
 # ---------------------------------------------------------------------------
 # Tests: find_expiring_contracts
 # ---------------------------------------------------------------------------
 
+class TestBuildExpiringQuery:
+
+    def test_range(self):
+        assert _build_expiring_query("2026-01-01", "2026-03-01", False, "") == (
+            "contract_end_date>='2026-01-01' AND contract_end_date<='2026-03-01'"
+        )
+
+    def test_include_expired_drops_lower_bound(self):
+        assert _build_expiring_query("2026-01-01", "2026-03-01", True, "") == (
+            "contract_end_date<='2026-03-01'"
+        )
+
+    def test_status_filter(self):
+        assert _build_expiring_query("2026-01-01", "2026-03-01", True, "Active") == (
+            "contract_end_date<='2026-03-01' AND wfstate='Active'"
+        )
+
+
 class TestFindExpiringContracts:
 
     @pytest.mark.asyncio
@@ -346,6 +581,40 @@ class TestFindExpiringContracts:
         assert data["data"]["summary"]["expired_count"] == 1
         assert "expired" in data["data"]
 
+    @pytest.mark.asyncio
+    async def test_date_formats(self, mock_client):
+        """Datetime suffixes and loosely formatted dates should parse; junk should warn."""
+        future = datetime.now() + timedelta(days=200)
+        contracts = [
+            {"id": 1, "contract_end_date": future.strftime("%Y-%m-%d") + " 00:00:00"},
+            {"id": 2, "contract_end_date": f"{future.year}-{future.month}-{future.day}"},
+            {"id": 3, "contract_end_date": "not a date"},
+        ]
+        mock_client.search_records.return_value = contracts
+
+        result = await handle_find_expiring_contracts(
+            {"days_from_now": 365}, mock_client,
+        )
+        data = _parse(result)
+
+        assert data["data"]["summary"]["planning_count"] == 2
+        assert all(c["days_remaining"] == 199 for c in data["data"]["planning"])
+        assert any("Contract 3" in w for w in data["warnings"])
+
+    @pytest.mark.asyncio
+    async def test_large_response_compact_when_pretty_configured(self, mock_client):
+        """Expiring-contract lists stay compact even in pretty-print mode."""
+        mock_client.search_records.return_value = []
+        serialization.set_compact(False)
+        try:
+            expiring = await handle_find_expiring_contracts({}, mock_client)
+            preflight = await handle_preflight_create_contract({}, mock_client)
+        finally:
+            serialization.set_compact(True)
+
+        assert "\n" not in expiring[0].text
+        assert "\n" in preflight[0].text
+
     @pytest.mark.asyncio
     async def test_no_results(self, mock_client):
         """Empty results should suggest increasing range."""
@@ -495,6 +764,120 @@ class TestOnboardCompanyWithContact:
         assert "company_name" in data["error"].lower()
 
 
+# ---------------------------------------------------------------------------
+# Tests: workflow result cache
+# ---------------------------------------------------------------------------
+
+class TestWorkflowResultCache:
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self):
+        configure_result_cache(5)
+        yield
+        configure_result_cache(0)
+
+    @pytest.mark.asyncio
+    async def test_repeated_read_served_from_cache(self, mock_client):
+        mock_client.search_records.return_value = []
+
+        first = await handle_find_expiring_contracts({"days_from_now": 30}, mock_client)
+        second = await handle_find_expiring_contracts({"days_from_now": 30}, mock_client)
+
+        assert first == second
+        mock_client.search_records.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_different_arguments_not_shared(self, mock_client):
+        mock_client.search_records.return_value = []
+
+        await handle_find_expiring_contracts({"days_from_now": 30}, mock_client)
+        await handle_find_expiring_contracts({"days_from_now": 60}, mock_client)
+
+        assert mock_client.search_records.call_count == 2
+        first_query, second_query = (
+            c[0][1] for c in mock_client.search_records.call_args_list
+        )
+        assert first_query != second_query
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, mock_client):
+        mock_client.search_records.side_effect = [Exception("boom"), []]
+
+        first = await handle_find_expiring_contracts({}, mock_client)
+        second = await handle_find_expiring_contracts({}, mock_client)
+
+        assert _parse(first)["success"] is False
+        assert _parse(second)["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_response_not_decoded_to_decide_caching(self, mock_client):
+        """Caching should not parse the serialized response back."""
+        mock_client.search_records.return_value = []
+
+        with patch("json.loads", side_effect=AssertionError("decoded response")):
+            await handle_find_expiring_contracts({}, mock_client)
+        await handle_find_expiring_contracts({}, mock_client)
+
+        mock_client.search_records.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_entity_write_invalidates(self, mock_client):
+        mock_client.search_records.return_value = []
+        mock_client.update_record.return_value = {"id": 1}
+
+        await handle_find_expiring_contracts({}, mock_client)
+        await handle_update(get_entity("contract"), {"record_id": 1, "data": {}}, mock_client)
+        await handle_find_expiring_contracts({}, mock_client)
+
+        assert mock_client.search_records.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_workflow_write_invalidates(self, mock_client):
+        mock_client.search_records.return_value = []
+
+        await handle_find_expiring_contracts({}, mock_client)
+        await handle_onboard_company_with_contact(
+            {"company_data": {"company_name": "Acme"}}, mock_client,
+        )
+        mock_client.search_records.reset_mock()
+        await handle_find_expiring_contracts({}, mock_client)
+
+        mock_client.search_records.assert_called_once()
+
+
+class TestWorkflowCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_run(self, mock_client):
+        """Parallel identical reads should make one set of API calls."""
+        release = asyncio.Event()
+
+        async def slow_search(*args, **kwargs):
+            await release.wait()
+            return []
+
+        mock_client.search_records.side_effect = slow_search
+        calls = [
+            asyncio.ensure_future(handle_find_expiring_contracts({}, mock_client))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        mock_client.search_records.assert_called_once()
+        assert results[0] == results[1] == results[2]
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_shared_without_cache(self, mock_client):
+        mock_client.search_records.return_value = []
+
+        await handle_find_expiring_contracts({}, mock_client)
+        await handle_find_expiring_contracts({}, mock_client)
+
+        assert mock_client.search_records.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # Tests: dispatch_workflow_call
 # ---------------------------------------------------------------------------
@@ -508,9 +891,11 @@ class TestDispatchWorkflowCall:
             {"id": 1, "contract_type": "NDA", "party_type": "Customer"},
         ]
 
-        dispatch = {"agiloft_preflight_create_contract": "preflight_create_contract"}
+        table = build_workflow_handler_table(
+            {"agiloft_preflight_create_contract": "preflight_create_contract"}
+        )
         result = await dispatch_workflow_call(
-            "agiloft_preflight_create_contract", {}, mock_client, dispatch,
+            "agiloft_preflight_create_contract", {}, mock_client, table,
         )
         data = _parse(result)
 
@@ -525,14 +910,18 @@ class TestDispatchWorkflowCall:
                 "agiloft_nonexistent", {}, mock_client, {},
             )
 
-    @pytest.mark.asyncio
-    async def test_unknown_handler_raises(self, mock_client):
-        """Unknown handler name should raise ValueError."""
+    def test_handler_table_resolves_handlers(self):
+        """The table should map tool names straight to handler functions."""
+        table = build_workflow_handler_table(
+            {"agiloft_preflight_create_contract": "preflight_create_contract"}
+        )
+
+        assert table["agiloft_preflight_create_contract"] is handle_preflight_create_contract
+
+    def test_handler_table_rejects_unknown_handler(self):
+        """Unknown handler names should fail when the table is built."""
         with pytest.raises(ValueError, match="Unknown workflow handler"):
-            await dispatch_workflow_call(
-                "agiloft_test", {}, mock_client,
-                {"agiloft_test": "nonexistent_handler"},
-            )
+            build_workflow_handler_table({"agiloft_test": "nonexistent_handler"})
 
     def test_all_handlers_registered(self):
         """All handler names in dispatch should be in WORKFLOW_HANDLERS."""
@@ -567,7 +956,14 @@ class TestAttachFileToContract:
         mock_client.create_record.return_value = {
             "success": True, "result": 501
         }
-        mock_client.attach_file.return_value = {"success": True}
+        uploaded = {}
+
+        async def attach_file(api_path, record_id, field, file_name, file_path):
+            with open(file_path, "rb") as f:
+                uploaded["content"] = f.read()
+            return {"success": True}
+
+        mock_client.attach_file.side_effect = attach_file
         mock_client.get_attachment_info.return_value = {
             "count": 1, "files": [{"name": "test.pdf"}]
         }
@@ -590,7 +986,9 @@ class TestAttachFileToContract:
         # Verify file_name was derived from path
         attach_call = mock_client.attach_file.call_args
         assert attach_call[0][3] == "test.pdf"
-        assert attach_call[0][4] == b"PDF content here"
+        # The path is handed to the client, which streams the file from disk
+        assert attach_call.kwargs["file_path"] == str(test_file)
+        assert uploaded["content"] == b"PDF content here"
 
     @pytest.mark.asyncio
     async def test_missing_file_path(self, mock_client):
@@ -669,6 +1067,41 @@ class TestAttachFileToContract:
         assert data["success"] is False
         assert "not found" in data["error"].lower()
 
+    @pytest.mark.asyncio
+    async def test_empty_file_rejected_without_api_calls(self, mock_client, tmp_path):
+        """An empty file should be rejected before reading it or calling the API."""
+        test_file = tmp_path / "empty.pdf"
+        test_file.write_bytes(b"")
+
+        result = await handle_attach_file_to_contract(
+            {"contract_id": 100, "file_path": str(test_file)},
+            mock_client,
+        )
+        data = _parse(result)
+
+        assert data["success"] is False
+        assert "empty" in data["error"].lower()
+        mock_client.get_record.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_file_read_error(self, mock_client, tmp_path):
+        """A failed read should be reported as a file error, not an API error."""
+        test_file = tmp_path / "test.pdf"
+        test_file.write_bytes(b"hello")
+        mock_client.get_record.return_value = {"id": 100, "contract_title1": "Test"}
+
+        with patch("src.workflow_handlers.open", side_effect=OSError("I/O error"), create=True):
+            result = await handle_attach_file_to_contract(
+                {"contract_id": 100, "file_path": str(test_file)},
+                mock_client,
+            )
+        data = _parse(result)
+
+        assert data["success"] is False
+        assert "Could not read file" in data["error"]
+        mock_client.get_record.assert_not_called()
+        mock_client.create_record.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_contract_missing_title(self, mock_client, tmp_path):
         """Should error when contract has no title."""